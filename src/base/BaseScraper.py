@@ -1,18 +1,171 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import csv
+import functools
 import json
+import os
 import time
 import random
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+# Optional: orjson for faster JSON parsing (stdlib json as fallback)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except Exception:
+    orjson = None  # type: ignore
+    _json_loads = json.loads
+
+# Optional: lxml as the BeautifulSoup tree builder (C parser, much faster than html.parser)
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = "lxml"
+except Exception:
+    _HTML_PARSER = "html.parser"
+
+# Optional: requests_cache for a persistent on-disk HTTP cache
+try:
+    from requests_cache import CachedSession, DO_NOT_CACHE
+except Exception:  # keep going with a plain requests.Session
+    CachedSession = None  # type: ignore
+    DO_NOT_CACHE = 0  # type: ignore
+
+
+@functools.lru_cache(maxsize=8)
+def _shared_session(
+    headers: Tuple[Tuple[str, str], ...],
+    total: int,
+    backoff: float,
+    status: Tuple[int, ...],
+    cache_json: str,
+) -> requests.Session:
+    """Build (once per distinct config) a session with default headers, retries and
+    an optional requests_cache backend. Arguments are hashable so lru_cache can key on them."""
+    if cache_json:
+        cache = json.loads(cache_json)
+        Path(cache["path"]).parent.mkdir(parents=True, exist_ok=True)
+        sess: requests.Session = CachedSession(
+            cache["path"],
+            backend="sqlite",
+            expire_after=cache["expire_after"],
+            urls_expire_after=cache["urls_expire_after"],
+            allowable_methods=("GET",),
+            cache_control=True,
+        )
+    else:
+        sess = requests.Session()
+    sess.headers.update(dict(headers))
+
+    retry = Retry(
+        total=total,
+        read=total,
+        connect=total,
+        backoff_factor=backoff,
+        status_forcelist=status,
+        allowed_methods=("GET", "POST"),
+        raise_on_status=False,
+    )
+    # roomy pools: several scrapers (and worker threads) share this session
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=20, pool_maxsize=50)
+    sess.mount("http://", adapter)
+    sess.mount("https://", adapter)
+    return sess
+
+
+@functools.lru_cache(maxsize=4)
+def _load_task_index(path: Path, mtime: float) -> Dict[str, Dict[str, Any]]:
+    """Flatten every supported task.json shape into a single {name: task} mapping.
+    ``mtime`` is only part of the cache key, so edits to the file invalidate it."""
+    try:
+        with open(path, "rb") as f:
+            data = _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+    index: Dict[str, Dict[str, Any]] = {}
+
+    def _add_mapping(mapping: Dict[str, Any]) -> None:
+        for name, t in mapping.items():
+            if isinstance(t, dict):
+                t = t.copy()
+                t.setdefault("name", name)
+                index[name] = t
+
+    def _add_list(items: List[Any]) -> None:
+        listed: Dict[str, Dict[str, Any]] = {}
+        for t in items:  # first entry with a given name wins
+            if isinstance(t, dict) and isinstance(t.get("name"), str):
+                listed.setdefault(t["name"], t)
+        index.update(listed)
+
+    # Insert lowest-priority shapes first so higher-priority ones overwrite them
+    if isinstance(data, dict):
+        _add_mapping(data)
+        tasks = data.get("tasks")
+        if isinstance(tasks, list):
+            _add_list(tasks)
+        elif isinstance(tasks, dict):
+            _add_mapping(tasks)
+    elif isinstance(data, list):
+        _add_list(data)
+    return index
+
+
+@functools.lru_cache(maxsize=1)
+def _setup_queue_logging() -> None:
+    """basicConfig() equivalent whose records go through a queue: callers (including
+    asyncio tasks) only enqueue, a background listener thread formats and writes."""
+    root = logging.getLogger()
+    if root.handlers:
+        return  # already configured by the host application (basicConfig would no-op too)
+    handler = logging.StreamHandler()
+    # handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s"))
+    handler.setFormatter(logging.Formatter("[%(levelname)s] - %(message)s"))
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(q, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # drain pending records on exit
+    root.addHandler(QueueHandler(q))
+    root.setLevel(logging.INFO)
+
+
+class _HostLimiter:
+    """Per-host request pacing for afetch(): a token bucket (GCRA form) that can be
+    tightened at runtime when the server signals rate limiting."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.min_rate = rate / 8
+        self.burst = max(1, burst)
+        self._tat = 0.0  # theoretical arrival time of the next request
+        self._blocked_until = 0.0
+
+    def reserve(self) -> float:
+        """Claim the next slot and return how long the caller must wait for it."""
+        now = time.monotonic()
+        interval = 1.0 / self.rate
+        tat = max(self._tat, now, self._blocked_until)
+        start = max(now, self._blocked_until, tat - (self.burst - 1) * interval)
+        self._tat = tat + interval
+        return start - now
+
+    def back_off(self, delay: float) -> None:
+        """Server asked us to slow down: pause the host and halve its rate."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        self.rate = max(self.rate / 2, self.min_rate)
+
 
 class BaseScraper:
     """
@@ -28,10 +181,14 @@ class BaseScraper:
 
     Common helpers:
       - fetch(url): get a Response with retries and default headers
-      - get_soup(url): fetch + parse HTML to BeautifulSoup
+        (GETs go through an on-disk cache when requests_cache is installed)
+      - afetch(url): awaitable fetch() for asyncio callers (per-host rate limiting)
+      - get_soup(url): fetch + parse HTML to BeautifulSoup (aget_soup for asyncio)
+      - make_soup(html): parse HTML with lxml (html.parser fallback)
       - save_csv(rows, filename, fieldnames): write CSV file in meta_dir
       - append_csv(row, filename, fieldnames): append (create if not exists)
       - read_csv(filename): read CSV rows as list[dict]
+      - iter_csv(filename): stream CSV rows as dicts without building a list
     """
 
     # ---------- construction ----------
@@ -44,16 +201,17 @@ class BaseScraper:
         meta_root: str | Path = "metafiles",
         download_root: str | Path = "downloads",
         logger: Optional[logging.Logger] = None,
+        use_cache: bool = True,
     ) -> None:
         self.task_name = task_name
         self.config_path = Path(config_path)
         self.task_path = Path(task_path)
         self.meta_root = Path(meta_root)
         self.download_root = Path(download_root)
+        self.use_cache = use_cache
 
         # Load configs
         self.config: Dict[str, Any] = self._load_json(self.config_path, default={})
-        self._tasks: Any = self._load_json(self.task_path, default={})
         self.task: Dict[str, Any] = self._resolve_task(task_name)
 
         # Derive I/O directories (do not auto-create per-task subdirs here)
@@ -62,30 +220,35 @@ class BaseScraper:
 
         # Logging
         if logger is None:
-            logging.basicConfig(
-                level=logging.INFO,
-                # format="[%(asctime)s] %(levelname)s - %(message)s",
-                format="[%(levelname)s] - %(message)s",
-            )
+            _setup_queue_logging()
             logger = logging.getLogger(self.__class__.__name__)
         self.log = logger
 
         # HTTP session w/ retries
         self.session = self._build_session()
 
+        # CSV headers seen by save_csv/append_csv, keyed by filename
+        self._csv_headers: Dict[str, List[str]] = {}
+
         # Request pacing
         self.default_sleep = float(self.config.get("sleep_seconds", 1.0))
         self.jitter = float(self.config.get("sleep_jitter", 0.3))
+        self._jitter_span = 2.0 * self.jitter if self.jitter > 0 else 0.0
+        self._time_sleep = time.sleep
+
+        # afetch(): per-host token buckets, config.json -> rate_per_host (requests/s)
+        self.rate_per_host = float(self.config.get("rate_per_host", 4.0))
+        self._host_limiters: Dict[str, _HostLimiter] = {}
 
     # ---------- JSON / config ----------
     @staticmethod
     def _load_json(path: Path, *, default: Any) -> Any:
         if not path.exists():
             return default
-        with open(path, "r", encoding="utf-8") as f:
+        with open(path, "rb") as f:
             try:
-                return json.load(f)
-            except json.JSONDecodeError:
+                return _json_loads(f.read())
+            except ValueError:  # json/orjson.JSONDecodeError, bad UTF-8
                 return default
 
     def _resolve_task(self, task_name: str) -> Dict[str, Any]:
@@ -97,41 +260,43 @@ class BaseScraper:
           3) {"my_task": {...}} (top-level mapping)
           4) [{"name": "my_task", ...}, ...] (top-level list)
         """
-        data = self._tasks
-
-        def _from_mapping(mapping: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-            if task_name in mapping:
-                t = mapping[task_name]
-                if isinstance(t, dict):
-                    t = t.copy()
-                    t.setdefault("name", task_name)
-                    return t
-            return None
-
-        if isinstance(data, dict):
-            # case 1 or 3
-            if "tasks" in data and isinstance(data["tasks"], dict):
-                found = _from_mapping(data["tasks"])  # type: ignore[arg-type]
-                if found:
-                    return found
-            if "tasks" in data and isinstance(data["tasks"], list):
-                for t in data["tasks"]:
-                    if isinstance(t, dict) and t.get("name") == task_name:
-                        return t.copy()
-            found = _from_mapping(data)
-            if found:
-                return found
-        elif isinstance(data, list):
-            # case 4
-            for t in data:
-                if isinstance(t, dict) and t.get("name") == task_name:
-                    return t.copy()
-
+        try:
+            mtime = self.task_path.stat().st_mtime
+        except OSError:
+            mtime = -1.0
+        task = _load_task_index(self.task_path, mtime).get(task_name)
+        if task is not None:
+            return task.copy()
         raise KeyError(f"Task '{task_name}' not found in {self.task_path}")
 
     # ---------- HTTP utilities ----------
+    # Listing feeds must always hit the network, otherwise new posts stay hidden
+    # until the cached page expires.
+    DEFAULT_CACHE_URLS_EXPIRE_AFTER: Dict[str, Any] = {
+        "bbs-api.miyoushe.com/post/wapi/getForumPostList": DO_NOT_CACHE,
+        "api-takumi-static.mihoyo.com/*/getContentList": DO_NOT_CACHE,
+        "zzz.mihoyo.com/news": DO_NOT_CACHE,
+    }
+
+    def _cache_settings(self, http_cfg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Resolved HTTP cache settings, or None when caching is unavailable/disabled.
+
+        config.json -> http.cache: {"enabled": true, "path": "...", "expire_after": 3600,
+                                    "urls_expire_after": {"host/path*": seconds}}
+        """
+        cache_cfg = http_cfg.get("cache", {}) if isinstance(http_cfg.get("cache", {}), dict) else {}
+        if CachedSession is None or not self.use_cache or not cache_cfg.get("enabled", True):
+            return None
+        urls_expire_after = dict(self.DEFAULT_CACHE_URLS_EXPIRE_AFTER)
+        urls_expire_after.update(cache_cfg.get("urls_expire_after", {}))
+        return {
+            "path": str(cache_cfg.get("path", self.meta_root / ".http_cache.sqlite")),
+            "expire_after": cache_cfg.get("expire_after", 3600),
+            "urls_expire_after": urls_expire_after,
+        }
+
     def _build_session(self) -> requests.Session:
-        sess = requests.Session()
+        http_cfg = self.config.get("http", {}) if isinstance(self.config, dict) else {}
 
         # Default headers may be overridden/merged by config.json -> http.headers
         headers = {
@@ -144,45 +309,104 @@ class BaseScraper:
             ),
             "Accept-Language": "en-US,en;q=0.8",
         }
-        http_cfg = self.config.get("http", {}) if isinstance(self.config, dict) else {}
         headers.update(http_cfg.get("headers", {}))
-        sess.headers.update(headers)
 
         # Retries
         retry_cfg = http_cfg.get("retry", {})
         total = int(retry_cfg.get("total", 3))
         backoff = float(retry_cfg.get("backoff_factor", 0.5))
         status = retry_cfg.get("status_forcelist", [429, 500, 502, 503, 504])
-        retry = Retry(
-            total=total,
-            read=total,
-            connect=total,
-            backoff_factor=backoff,
-            status_forcelist=status,
-            allowed_methods=("GET", "POST"),
-            raise_on_status=False,
+
+        cache = self._cache_settings(http_cfg)
+        # Scrapers with the same settings share one session (and its keep-alive pool)
+        return _shared_session(
+            tuple(headers.items()),
+            total,
+            backoff,
+            tuple(int(x) for x in status),
+            json.dumps(cache, sort_keys=True, default=str) if cache else "",
         )
-        adapter = HTTPAdapter(max_retries=retry)
-        sess.mount("http://", adapter)
-        sess.mount("https://", adapter)
-        return sess
 
-    def _sleep(self, seconds: Optional[float] = None) -> None:
+    def _pause_seconds(self, seconds: Optional[float] = None) -> float:
         base = self.default_sleep if seconds is None else float(seconds)
-        # small jitter to be polite and avoid rate limits
-        jitter = random.uniform(-self.jitter, self.jitter) if self.jitter > 0 else 0
-        time.sleep(max(0.0, base + jitter))
+        # small jitter in [-jitter, +jitter) to be polite and avoid rate limits
+        if self._jitter_span:
+            base += (random.random() - 0.5) * self._jitter_span
+        return base if base > 0.0 else 0.0
 
-    def fetch(self, url: str, *, method: str = "GET", **kwargs: Any) -> requests.Response:
-        self.log.info(f"fetching: {url}")
+    def _sleep(self, seconds: Optional[float] = None) -> None:
+        self._time_sleep(self._pause_seconds(seconds))
+
+    async def _asleep(self, seconds: Optional[float] = None) -> None:
+        """Same pacing as _sleep(), but yields to the event loop instead of blocking it."""
+        await asyncio.sleep(self._pause_seconds(seconds))
+
+    def _request(self, url: str, *, method: str = "GET", **kwargs: Any) -> requests.Response:
+        if self.log.isEnabledFor(logging.INFO):
+            self.log.info(f"fetching: {url}")
         resp = self.session.request(method=method, url=url, timeout=kwargs.pop("timeout", 20), **kwargs)
         resp.raise_for_status()
+        return resp
+
+    def fetch(self, url: str, *, method: str = "GET", **kwargs: Any) -> requests.Response:
+        resp = self._request(url, method=method, **kwargs)
         self._sleep()
         return resp
 
-    def get_soup(self, url: str, **kwargs: Any) -> BeautifulSoup:
+    async def afetch(self, url: str, *, method: str = "GET", **kwargs: Any) -> requests.Response:
+        """Async fetch(): the blocking request runs in a worker thread (same session,
+        retries and cache). Instead of a fixed sleep, requests are paced by a per-host
+        token bucket that backs off on 429 / Retry-After / X-RateLimit-Remaining."""
+        limiter = self._limiter_for(url)
+        delay = limiter.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            resp = await asyncio.to_thread(self._request, url, method=method, **kwargs)
+        except requests.HTTPError as e:
+            if e.response is not None:
+                self._observe_rate_limit(limiter, e.response)
+            raise
+        self._observe_rate_limit(limiter, resp)
+        return resp
+
+    def _limiter_for(self, url: str) -> _HostLimiter:
+        host = urlparse(url).netloc
+        limiter = self._host_limiters.get(host)
+        if limiter is None:
+            limiter = self._host_limiters[host] = _HostLimiter(self.rate_per_host, burst=2)
+        return limiter
+
+    def _observe_rate_limit(self, limiter: _HostLimiter, resp: requests.Response) -> None:
+        if getattr(resp, "from_cache", False):
+            return
+        retry_after = resp.headers.get("Retry-After")
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        if resp.status_code == 429 or retry_after or (remaining is not None and remaining.strip() == "0"):
+            try:
+                delay = float(retry_after) if retry_after else self._pause_seconds()
+            except ValueError:  # HTTP-date form; not worth parsing here
+                delay = self._pause_seconds()
+            self.log.info(f"rate limited by {urlparse(resp.url).netloc}; backing off {delay:.1f}s")
+            limiter.back_off(delay)
+
+    @staticmethod
+    def make_soup(html: str | bytes, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+        """Parse HTML with lxml when installed, html.parser otherwise.
+
+        ``parse_only`` keeps just the subtrees rooted at matching tags (their
+        ancestors are dropped), so only pass one when no selector needs the context.
+        """
+        return BeautifulSoup(html, _HTML_PARSER, parse_only=parse_only)
+
+    def get_soup(self, url: str, *, parse_only: SoupStrainer | None = None, **kwargs: Any) -> BeautifulSoup:
         resp = self.fetch(url, **kwargs)
-        return BeautifulSoup(resp.text, "html.parser")
+        return self.make_soup(resp.text, parse_only)
+
+    async def aget_soup(self, url: str, *, parse_only: SoupStrainer | None = None, **kwargs: Any) -> BeautifulSoup:
+        """Async get_soup(): parsing also runs off the event loop."""
+        resp = await self.afetch(url, **kwargs)
+        return await asyncio.to_thread(self.make_soup, resp.text, parse_only)
 
     # ---------- CSV helpers (in meta_dir) ----------
     def save_csv(
@@ -192,22 +416,22 @@ class BaseScraper:
         fieldnames: Optional[List[str]] = None,
     ) -> Path:
         path = self.meta_dir / filename
-        rows = list(rows)
-        if not rows and fieldnames is None:
-            raise ValueError("save_csv requires fieldnames when rows is empty")
         if fieldnames is None:
+            # the key union needs every row up front; otherwise rows are streamed
+            rows = list(rows)
+            if not rows:
+                raise ValueError("save_csv requires fieldnames when rows is empty")
             # union of keys in insertion order
-            keys: List[str] = []
+            keys: Dict[str, None] = {}
             for r in rows:
-                for k in r.keys():
-                    if k not in keys:
-                        keys.append(k)
-            fieldnames = keys
+                keys.update(dict.fromkeys(r.keys()))
+            fieldnames = list(keys)
         with open(path, "w", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
             for r in rows:
                 writer.writerow({k: r.get(k, "") for k in fieldnames})
+        self._csv_headers[filename] = list(fieldnames)
         self.log.info(f"wrote CSV: {path}")
         return path
 
@@ -225,38 +449,71 @@ class BaseScraper:
             return self.save_csv([row], filename, fieldnames)
         # ensure header has all keys
         if fieldnames is None:
-            with open(path, "r", encoding="utf-8") as f:
-                reader = csv.reader(f)
-                header = next(reader, [])
+            header = self._csv_header(filename)
             fieldnames = list(dict.fromkeys([*header, *row.keys()]))
             if header != fieldnames:
-                # rewrite with upgraded header
-                rows = self.read_csv(filename)
-                rows.append(row)
-                return self.save_csv(rows, filename, fieldnames)
+                return self._rewrite_csv_header(row, filename, header, fieldnames)
         with open(path, "a", newline="", encoding="utf-8") as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if not exists:
-                writer.writeheader()
             writer.writerow({k: row.get(k, "") for k in fieldnames})
         self.log.info(f"appended row to: {path}")
         return path
 
+    def _csv_header(self, filename: str) -> List[str]:
+        """Header of an existing CSV in meta_dir; reads only the first line, cached per filename."""
+        header = self._csv_headers.get(filename)
+        if header is None:
+            with open(self.meta_dir / filename, "r", newline="", encoding="utf-8") as f:
+                line = f.readline()
+            header = next(csv.reader([line]), []) if line else []
+            self._csv_headers[filename] = header
+        return header
+
+    def _rewrite_csv_header(
+        self,
+        row: Dict[str, Any],
+        filename: str,
+        header: List[str],
+        fieldnames: List[str],
+    ) -> Path:
+        """Upgrade the header to `fieldnames` (header + new keys) and append `row`.
+
+        Streams the old rows into a temp file row by row, then swaps it in.
+        """
+        path = self.meta_dir / filename
+        tmp = path.with_name(path.name + ".tmp")
+        pad = [""] * (len(fieldnames) - len(header))
+        with open(path, "r", newline="", encoding="utf-8") as src, \
+                open(tmp, "w", newline="", encoding="utf-8") as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            next(reader, None)
+            writer.writerow(fieldnames)
+            for old in reader:
+                writer.writerow(old + pad if len(old) == len(header) else old)
+            writer.writerow([row.get(k, "") for k in fieldnames])
+        os.replace(tmp, path)
+        self._csv_headers[filename] = list(fieldnames)
+        self.log.info(f"appended row to: {path} (header upgraded)")
+        return path
+
     def read_csv(self, filename: str) -> List[Dict[str, str]]:
+        return list(self.iter_csv(filename))
+
+    def iter_csv(self, filename: str) -> Iterator[Dict[str, str]]:
+        """Yield CSV rows one at a time; the file stays open only while iterating."""
         path = self.meta_dir / filename
         if not path.exists():
-            return []
+            return
         with open(path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            return [dict(row) for row in reader]
+            yield from csv.DictReader(f)
 
     # ---------- filesystem helpers ----------
-    @staticmethod
-    def sanitize_filename(name: str) -> str:
-        bad = "\\/:*?\"<>|\n\r\t"
-        for ch in bad:
-            name = name.replace(ch, "_")
-        return name.strip().strip(".")
+    _SANITIZE_TABLE = str.maketrans({c: "_" for c in "\\/:*?\"<>|\n\r\t"})
+
+    @classmethod
+    def sanitize_filename(cls, name: str) -> str:
+        return name.translate(cls._SANITIZE_TABLE).strip().strip(".")
 
     def ensure_subdir(self, *parts: str) -> Path:
         p = self.download_dir.joinpath(*parts)
@@ -6,7 +6,9 @@ What it does (batch mode):
 - Columns used: post_name, minas_link, minas_pwd
 - For each row:
     - If ./downloads/米游社-官方资讯-minas/<post_name> exists -> SKIP (no network)
-    - Else: open share, click ZIP, print progress, download, unzip to <post_name>, delete .zip
+    - Else: request a zip task from the Seafile API, print progress, stream the archive,
+      unzip to <post_name>, delete .zip (falls back to clicking ZIP in a headless browser)
+- Rows run concurrently (MINAS_CONCURRENCY, default 4); browser fallbacks share one context
 
 Quick start:
   pip install playwright requests bs4
@@ -32,18 +34,23 @@ from __future__ import annotations
 import argparse
 import asyncio
 import csv
+import functools
 import os
 import re
 import shutil
 import sys
+import threading
+import time
 import zipfile
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Set, Tuple
 from urllib.parse import urlparse
 import urllib.parse
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 # --- Defaults (override via CLI or env) ---
 DEFAULT_URL = os.getenv("MINAS_URL", "https://minas.mihoyo.com/d/97936e3e62a949b2930d/")
@@ -58,12 +65,17 @@ USER_AGENT = (
 API_BASE = "https://minas.mihoyo.com"
 ROW_TIMEOUT_SEC = int(os.getenv("MINAS_ROW_TIMEOUT", "420"))  # per-row timeout to avoid getting stuck
 MAX_ROWS = os.getenv("MINAS_MAX_ROWS")  # optional limit for CI/debug
+CONCURRENCY = int(os.getenv("MINAS_CONCURRENCY", "4"))  # rows processed at once in batch mode
+POLL_MIN_SEC = 0.7  # progress poll interval while the zip is moving
+POLL_MAX_SEC = 5.0  # backoff cap when progress stalls or the server answers 304
 
 # --------------------- Utilities ---------------------
 
+# '<>|' stay allowed: post names like "A | B" must keep matching existing folders
+_SANITIZE_TABLE = str.maketrans({c: "_" for c in '\\/:*?"'})
+
 def sanitize_filename(name: str) -> str:
-    # return re.sub(r"[\\/:*?\"<>|]", "_", name or "").strip() or "untitled"
-    return re.sub(r"[\\/:*?\"]", "_", name or "").strip() or "untitled"
+    return (name or "").translate(_SANITIZE_TABLE).strip() or "untitled"
 
 
 def _norm_cell(val: str | None) -> str:
@@ -83,9 +95,123 @@ def _norm_outer_quotes(val: str | None) -> str:
         v = v[1:-1].strip()
     return v
 
+def _preallocate(out, size: int) -> None:
+    """Reserve the full size of a member up front (Linux only; best effort)."""
+    if size > 0 and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(out.fileno(), 0, size)
+        except OSError:
+            pass  # e.g. filesystem without fallocate support
+
+def _extract_zip(dest: Path, out_dir: Path, force_extract_dir: Path | None = None) -> None:
+    """Unzip & clean — flatten when extracting into a forced directory."""
+    try:
+        with zipfile.ZipFile(dest, 'r') as zip_ref:
+            members = zip_ref.namelist()
+            roots = set()
+            for m in members:
+                if not m:
+                    continue
+                parts = m.split('/')
+                if len(parts) > 1 and parts[0]:
+                    roots.add(parts[0])
+                else:
+                    roots.add('')  # a file at the archive root
+            has_single_root = ('' not in roots) and (len(roots) == 1)
+
+            # decide extraction target
+            if force_extract_dir is not None:
+                extract_dir = force_extract_dir
+                extract_dir.mkdir(parents=True, exist_ok=True)
+            elif has_single_root:
+                extract_dir = out_dir
+            else:
+                extract_dir = out_dir / dest.stem
+                extract_dir.mkdir(parents=True, exist_ok=True)
+
+            # If forced dir and zip had a single top-level folder, flatten it while
+            # extracting (strip the root from each member) instead of moving afterwards
+            flatten = force_extract_dir is not None and has_single_root
+            for info in zip_ref.infolist():
+                name = info.filename
+                if flatten:
+                    name = name.split('/', 1)[1] if '/' in name else ''
+                # same sanitizing as ZipFile.extract: no absolute paths, no '..'
+                parts = [p for p in name.split('/') if p not in ('', '.', '..')]
+                if not parts:
+                    continue
+                target = extract_dir.joinpath(*parts)
+                if info.is_dir():
+                    target.mkdir(parents=True, exist_ok=True)
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with zip_ref.open(info) as src, open(target, 'wb') as out:
+                    _preallocate(out, info.file_size)
+                    shutil.copyfileobj(src, out, length=1 << 20)
+
+        dest.unlink()
+        print(f"Extracted to {extract_dir} and removed zip.")
+    except Exception as e:
+        print(f"Failed to extract zip {dest}: {e}")
+
+def _check_alive(stop: threading.Event | None, deadline: float | None) -> None:
+    """Raise TimeoutError once the row was cancelled or its deadline (monotonic) passed.
+
+    Worker threads can't be cancelled by asyncio.wait_for, so they poll this.
+    """
+    if stop is not None and stop.is_set():
+        raise TimeoutError("row cancelled")
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError("row deadline passed")
+
+def _stream_to_file(
+    session: requests.Session,
+    url: str,
+    dest: Path,
+    referer: str | None = None,
+    stop: threading.Event | None = None,
+    deadline: float | None = None,
+) -> None:
+    """Stream a GET response straight from the socket to dest in 1 MiB chunks (removes dest on failure).
+
+    stop/deadline are checked between chunks, so a timed-out row stops writing.
+    """
+    headers = {"User-Agent": USER_AGENT}
+    if referer:
+        headers["Referer"] = referer
+    try:
+        with session.get(url, headers=headers, stream=True, timeout=60) as resp:
+            resp.raise_for_status()
+            with open(dest, "wb") as f:
+                for chunk in resp.iter_content(chunk_size=1 << 20):
+                    _check_alive(stop, deadline)
+                    if chunk:
+                        f.write(chunk)
+    except Exception:
+        dest.unlink(missing_ok=True)
+        raise
+
 # --------------------- Static path (requests) ---------------------
 
-def authenticate_with_password(session: requests.Session, url: str, password: str) -> requests.Response:
+@functools.lru_cache(maxsize=1)
+def _shared_http_adapter() -> HTTPAdapter:
+    """One keep-alive connection pool for every static/API request to minas.mihoyo.com."""
+    return HTTPAdapter(pool_connections=4, pool_maxsize=max(10, CONCURRENCY * 2))
+
+def _new_http_session() -> requests.Session:
+    """Fresh session (own cookie jar, so its own share login) on the shared pool.
+
+    Sessions are not thread-safe and concurrent shares must not share a Seafile
+    sessionid; only the adapter's connection pool is shared between them.
+    """
+    sess = requests.Session()
+    adapter = _shared_http_adapter()
+    sess.mount("http://", adapter)
+    sess.mount("https://", adapter)
+    return sess
+
+def authenticate_with_password(session: requests.Session | None, url: str, password: str) -> requests.Response:
+    session = session or _new_http_session()
     headers = {"User-Agent": USER_AGENT, "Referer": url}
     r = session.get(url, headers=headers, allow_redirects=True, timeout=30)
     r.raise_for_status()
@@ -122,6 +248,114 @@ def authenticate_with_password(session: requests.Session, url: str, password: st
         raise RuntimeError("Static auth failed — password field still present.")
     return auth
 
+# --------------------- ZIP via Seafile API (requests) ---------------------
+
+_SHARE_TOKEN_RE = re.compile(r"/d/([0-9A-Za-z]+)")
+
+
+def _share_token(url: str) -> str:
+    m = _SHARE_TOKEN_RE.search(urlparse(url).path)
+    if not m:
+        raise ValueError(f"Not a share link: {url}")
+    return m.group(1)
+
+
+def _zip_via_api(
+    url: str,
+    password: str,
+    path: str,
+    out_dir: Path,
+    force_extract_dir: Path | None = None,
+    session: requests.Session | None = None,
+    stop: threading.Event | None = None,
+    deadline: float | None = None,
+) -> Path:
+    """
+    Browser-free ZIP: ask Seafile for a zip task on the share, poll its progress
+    and stream /seafhttp/zip/<zip_token> to disk with the authenticated session.
+    Raises on any failure so callers can fall back to the Playwright flow.
+    stop/deadline (time.monotonic) end the poll, the stream and the extraction
+    early when the batch row times out.
+    """
+    session = session or _new_http_session()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if not path.startswith('/'):
+        path = '/' + path
+    if not path.endswith('/'):
+        path = path + '/'
+
+    token = _share_token(url)
+    authenticate_with_password(session, url, password)
+    headers = {"User-Agent": USER_AGENT, "Referer": url, "Accept": "application/json, text/plain, */*"}
+
+    print(f"Zipping {path} (api)…")
+    r = session.get(
+        f"{API_BASE}/api/v2.1/share-link-zip-task/",
+        params={"share_link_token": token, "path": path},
+        headers=headers,
+        timeout=30,
+    )
+    r.raise_for_status()
+    zip_token = (r.json() or {}).get("zip_token")
+    if not zip_token:
+        raise RuntimeError("zip task returned no zip_token")
+    print(f"  zip token: {zip_token}")
+
+    # Poll until the server has packed every file; back off while nothing changes
+    poll_deadline = deadline if deadline is not None else time.monotonic() + (ROW_TIMEOUT_SEC if ROW_TIMEOUT_SEC > 0 else 3600)
+    wait = stop.wait if stop is not None else time.sleep
+    last_pct = -1
+    last_zipped = -1
+    etag = None
+    interval = POLL_MIN_SEC
+    while True:
+        _check_alive(stop, None)
+        if time.monotonic() > poll_deadline:
+            raise TimeoutError("zip progress did not complete in time")
+        pr = session.get(
+            f"{API_BASE}/api/v2.1/query-zip-progress/",
+            params={"token": zip_token},
+            headers={**headers, "If-None-Match": etag} if etag else headers,
+            timeout=30,
+        )
+        if pr.status_code == 304:
+            interval = min(interval * 2, POLL_MAX_SEC)
+            wait(interval)
+            continue
+        pr.raise_for_status()
+        etag = pr.headers.get("ETag") or etag
+        got = pr.json() or {}
+        zipped = int(got.get("zipped", got.get("done", 0)) or 0)
+        total = int(got.get("total", got.get("count", 0)) or 0)
+        pct = int((zipped * 100) / total) if total else 0
+        if pct != last_pct:
+            print(f"  progress: {zipped}/{total} ({pct}%)")
+            last_pct = pct
+        if int(got.get("canceled", 0) or 0):
+            raise RuntimeError("zip task canceled by server")
+        if int(got.get("failed", 0) or 0):
+            raise RuntimeError(f"zip task failed ({got.get('failed_reason') or got.get('error') or ''})")
+        if total and zipped >= total:
+            break
+        interval = POLL_MIN_SEC if zipped != last_zipped else min(interval * 2, POLL_MAX_SEC)
+        last_zipped = zipped
+        wait(interval)
+
+    if force_extract_dir is not None:
+        dest = out_dir / f"{force_extract_dir.name}.zip"
+    else:
+        dest = out_dir / sanitize_filename(f"{Path(path.rstrip('/')).name or token}.zip")
+    _stream_to_file(session, f"{API_BASE}/seafhttp/zip/{zip_token}", dest, referer=url, stop=stop, deadline=deadline)
+    print(f"Saved {dest} (size {dest.stat().st_size} bytes)")
+
+    try:
+        _check_alive(stop, deadline)
+    except TimeoutError:
+        dest.unlink(missing_ok=True)
+        raise
+    _extract_zip(dest, out_dir, force_extract_dir)
+    return dest
+
 # --------------------- ZIP via browser (Playwright) ---------------------
 
 async def _zip_current_path(
@@ -130,14 +364,38 @@ async def _zip_current_path(
     path: str,
     out_dir: Path,
     force_extract_dir: Path | None = None
+) -> Path:
+    """
+    Single-share entry point: launch a headless Chromium + context and hand it to
+    _zip_on_page(). Batch mode shares one browser/context across rows instead.
+    """
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(user_agent=USER_AGENT, accept_downloads=True)
+        try:
+            return await _zip_on_page(context, url, password, path, out_dir, force_extract_dir)
+        finally:
+            await context.close()
+            await browser.close()
+
+
+async def _zip_on_page(
+    context,
+    url: str,
+    password: str,
+    path: str,
+    out_dir: Path,
+    force_extract_dir: Path | None = None
 ) -> Path:
     """
     Open {url} with ?p={path}, click the green ZIP button, and save the archive.
     While zipping, print progress if the site emits /api/v2.1/query-zip-progress/?token=...
     Then unzip to force_extract_dir (if provided) or out_dir, flatten if needed, and delete the .zip.
+    Uses a fresh page in the given context and closes it afterwards; the context
+    (cookies, connection pool) stays alive for the next share.
     """
-    from playwright.async_api import async_playwright
-
     out_dir.mkdir(parents=True, exist_ok=True)
     # Normalize '/.../'
     if not path.startswith('/'):
@@ -149,10 +407,8 @@ async def _zip_current_path(
     q = urllib.parse.urlencode({"p": path, "mode": "list"})
     target = f"{url.rstrip('/')}/?{q}"
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(user_agent=USER_AGENT, accept_downloads=True)
-        page = await context.new_page()
+    page = await context.new_page()
+    try:
         await page.goto(target, wait_until="domcontentloaded")
         print(f"  page: {page.url}")
 
@@ -247,19 +503,35 @@ async def _zip_current_path(
             # Poll until 100% or download finishes
             async def _poll():
                 nonlocal last_pct
+                last_zipped = -1
+                etag = None
+                interval = int(POLL_MIN_SEC * 1000)
                 try:
                     while True:
                         if page.is_closed():
                             return
                         try:
-                            got = await page.evaluate(
-                                "(u)=>fetch(u,{credentials:'same-origin'}).then(r=>r.ok?r.json():null)", progress_url
+                            res = await page.evaluate(
+                                """([u, tag]) => fetch(u, {
+                                    credentials: 'same-origin',
+                                    headers: tag ? {'If-None-Match': tag} : {},
+                                }).then(async r => ({
+                                    status: r.status,
+                                    etag: r.headers.get('ETag'),
+                                    body: r.ok ? await r.json() : null,
+                                }))""",
+                                [progress_url, etag],
                             )
                         except Exception:
                             return  # page/context likely closed; exit quietly
+                        got = res.get("body") if res else None
+                        if res and res.get("etag"):
+                            etag = res["etag"]
                         if not got:
+                            # 304 (unchanged) or transient error: back off
+                            interval = min(interval * 2, int(POLL_MAX_SEC * 1000))
                             try:
-                                await page.wait_for_timeout(700)
+                                await page.wait_for_timeout(interval)
                             except Exception:
                                 return
                             continue
@@ -279,8 +551,13 @@ async def _zip_current_path(
                         elif total and zipped >= total:
                             print("  progress: 100% (zipped) — waiting for download…"); return
                         else:
+                            if zipped != last_zipped:
+                                interval = int(POLL_MIN_SEC * 1000)
+                            else:
+                                interval = min(interval * 2, int(POLL_MAX_SEC * 1000))
+                            last_zipped = zipped
                             try:
-                                await page.wait_for_timeout(700)
+                                await page.wait_for_timeout(interval)
                             except Exception:
                                 return
                 except Exception:
@@ -304,54 +581,20 @@ async def _zip_current_path(
                 dir_name = ""
             suggested = f"{dir_name}.zip" if dir_name else "archive.zip"
 
-        dest = out_dir / sanitize_filename(suggested)
+        # Concurrent batch rows share out_dir; name the archive after its target so they never collide
+        if force_extract_dir is not None:
+            dest = out_dir / f"{force_extract_dir.name}.zip"
+        else:
+            dest = out_dir / sanitize_filename(suggested)
+
+        # The browser is already fetching the archive when the download event fires,
+        # and Seafile zip tokens are single-use: keep its copy rather than re-fetching.
         await download.save_as(str(dest))
         size = dest.stat().st_size if dest.exists() else 0
         print(f"Saved {dest} (size {size} bytes)")
 
-        # Unzip & clean — flatten when extracting into a forced directory
-        try:
-            with zipfile.ZipFile(dest, 'r') as zip_ref:
-                members = zip_ref.namelist()
-                roots = set()
-                for m in members:
-                    if not m:
-                        continue
-                    parts = m.split('/')
-                    if len(parts) > 1 and parts[0]:
-                        roots.add(parts[0])
-                    else:
-                        roots.add('')  # a file at the archive root
-                has_single_root = ('' not in roots) and (len(roots) == 1)
-
-                # decide extraction target
-                if force_extract_dir is not None:
-                    extract_dir = force_extract_dir
-                    extract_dir.mkdir(parents=True, exist_ok=True)
-                elif has_single_root:
-                    extract_dir = out_dir
-                else:
-                    extract_dir = out_dir / dest.stem
-                    extract_dir.mkdir(parents=True, exist_ok=True)
-
-                zip_ref.extractall(extract_dir)
-
-                # If forced dir and zip had a single top-level folder, flatten it
-                if force_extract_dir is not None and has_single_root:
-                    root_name = next(iter(roots))
-                    inner = extract_dir / root_name
-                    if inner.exists() and inner.is_dir():
-                        for p in inner.iterdir():
-                            shutil.move(str(p), str(extract_dir / p.name))
-                        try:
-                            inner.rmdir()
-                        except Exception:
-                            pass
-
-            dest.unlink()
-            print(f"Extracted to {extract_dir} and removed zip.")
-        except Exception as e:
-            print(f"Failed to extract zip {dest}: {e}")
+        # Unzipping is blocking disk/CPU work; keep the event loop free for the other rows
+        await asyncio.to_thread(_extract_zip, dest, out_dir, force_extract_dir)
 
         if poll_task:
             try:
@@ -360,83 +603,232 @@ async def _zip_current_path(
                 pass
             if not poll_task.done():
                 poll_task.cancel()
-        await context.close()
-        await browser.close()
         return dest
+    finally:
+        if not page.is_closed():
+            await page.close()
 
 # --------------------- Batch from CSV ---------------------
 
 DEFAULT_CSV = Path("metafiles") / "米游社-官方资讯-minas.csv"
 BATCH_OUT_SUBDIR = "米游社-官方资讯-minas"
 
-async def _process_csv_row(row: dict, out_root: Path) -> None:
-    post_name = _norm_outer_quotes(row.get("post_name") or row.get("title") or row.get("name"))
-    url = _norm_cell(row.get("minas_link") or row.get("url") or row.get("link"))
-    password = _norm_cell(row.get("minas_pwd") or row.get("password") or row.get("passwd"))
-    post_time = _norm_cell(row.get("post_time") or "")
-
-    # Normalize post_time to yyyy.mm.dd if possible
-    norm_post_time = ""
-    if post_time:
-        # Acceptable formats: YYYY-MM-DD... or YYYY/MM/DD...
-        if len(post_time) >= 10 and (
-            (post_time[4] == '-' and post_time[7] == '-') or (post_time[4] == '/' and post_time[7] == '/')
-        ):
-            # Extract first 10 chars and replace - or / with .
-            norm_post_time = post_time[:10].replace("-", ".").replace("/", ".")
-        else:
-            norm_post_time = ""
+_DATE_RE = re.compile(r"(\d{4})([-/])(\d{2})\2(\d{2})", re.ASCII)
 
-    if not url or not password or not post_name:
-        print(f"[CSV] Skip (missing field): post_name='{post_name}' url='{url}' pwd={'yes' if bool(password) else 'no'}")
-        return
+# Accepted column names per field, in priority order
+_CSV_FIELDS = {
+    "post_name": ("post_name", "title", "name"),
+    "url": ("minas_link", "url", "link"),
+    "password": ("minas_pwd", "password", "passwd"),
+    "post_time": ("post_time",),
+}
 
-    folder_name = f"{norm_post_time} {post_name}" if norm_post_time else post_name
-    target_dir = out_root / sanitize_filename(folder_name)
-    if target_dir.exists():
-        print(f"[CSV] SKIP (exists): {target_dir}")
-        return
+# One normalized CSV row: (post_name, url, password, folder_name)
+CsvRow = Tuple[str, str, str, str]
+
+def _folder_name(post_name: str, post_time: str) -> str:
+    """Target folder for a CSV row: '<yyyy.mm.dd> <post_name>' or just post_name."""
+    # Normalize post_time (YYYY-MM-DD... or YYYY/MM/DD...) to yyyy.mm.dd if possible
+    m = _DATE_RE.match(post_time)
+    norm_post_time = f"{m[1]}.{m[3]}.{m[4]}" if m else ""
+
+    return f"{norm_post_time} {post_name}" if norm_post_time else post_name
+
+def _read_csv_rows(csv_path: Path) -> List[CsvRow]:
+    """Read the batch CSV with csv.reader, resolving column positions once from the header."""
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return []
+        pos = {name: i for i, name in enumerate(header)}  # last duplicate wins, like DictReader
+        cols = {
+            field: [pos[k] for k in keys if k in pos]
+            for field, keys in _CSV_FIELDS.items()
+        }
+        width = len(header)
+
+        def _get(row: List[str], field: str) -> str:
+            for i in cols[field]:
+                if i < len(row) and row[i]:
+                    return row[i]
+            return ""
+
+        rows: List[CsvRow] = []
+        for row in reader:
+            if not row:
+                continue  # DictReader skips blank lines too
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            post_name = _norm_outer_quotes(_get(row, "post_name"))
+            rows.append((
+                post_name,
+                _norm_cell(_get(row, "url")),
+                _norm_cell(_get(row, "password")),
+                _folder_name(post_name, _norm_cell(_get(row, "post_time"))),
+            ))
+    return rows
+
+def _clone_tree(src: Path, dst: Path) -> None:
+    """Copy an extracted post folder, hardlinking files when src and dst share a filesystem."""
+    def _link_or_copy(s: str, d: str) -> None:
+        try:
+            os.link(s, d)
+        except OSError:
+            shutil.copy2(s, d)
+
+    shutil.copytree(src, dst, copy_function=_link_or_copy)
+
+async def _process_csv_group(
+    group: List[CsvRow], out_root: Path, get_context, existing: Set[str], deadline: float | None = None
+) -> None:
+    """Download one share for every row in ``group`` (same link + password): the first
+    row zips and extracts it, the others get a hardlinked copy of that folder.
+    deadline (time.monotonic) is handed to the API worker thread, which asyncio
+    can't cancel."""
+    source_dir = None
+    for post_name, url, password, folder_name in group:
+        if not url or not password or not post_name:
+            print(f"[CSV] Skip (missing field): post_name='{post_name}' url='{url}' pwd={'yes' if bool(password) else 'no'}")
+            continue
+
+        target_name = sanitize_filename(folder_name)
+        target_dir = out_root / target_name
+        if target_name in existing:
+            print(f"[CSV] SKIP (exists): {target_dir}")
+            continue
+
+        if source_dir is not None:
+            print(f"[CSV] {folder_name}: same share as {source_dir.name}; linking -> {target_dir}")
+            await asyncio.to_thread(_clone_tree, source_dir, target_dir)
+            existing.add(target_name)
+            continue
 
-    print(f"[CSV] {folder_name}: {url} / -> {target_dir}")
-    await _zip_current_path(url, password, path="/", out_dir=out_root, force_extract_dir=target_dir)
+        print(f"[CSV] {folder_name}: {url} / -> {target_dir}")
+        stop = threading.Event()
+        worker = asyncio.ensure_future(
+            asyncio.to_thread(_zip_via_api, url, password, "/", out_root, target_dir, None, stop, deadline)
+        )
+        try:
+            await asyncio.shield(worker)
+        except asyncio.CancelledError:
+            # row timed out: tell the thread to stop and keep this row's semaphore
+            # slot until it has actually exited
+            stop.set()
+            await asyncio.gather(worker, return_exceptions=True)
+            raise
+        except Exception as e:
+            if deadline is not None and time.monotonic() > deadline:
+                raise
+            print(f"[CSV] {folder_name}: API zip failed ({e}); falling back to browser")
+            context = await get_context()
+            await _zip_on_page(context, url, password, path="/", out_dir=out_root, force_extract_dir=target_dir)
+        existing.add(target_name)
+        if target_dir.is_dir():
+            source_dir = target_dir
+
+async def _run_batch_async(groups: List[List[CsvRow]], out_root: Path, existing: Set[str]) -> None:
+    """
+    Process CSV rows concurrently under one event loop. Rows sharing a share
+    link are grouped so each share is zipped once. Shares go through the
+    Seafile API first; Chromium and its shared BrowserContext (cookies +
+    connection reuse for minas.mihoyo.com) are only launched on the first
+    fallback. At most MINAS_CONCURRENCY shares run at a time; each keeps
+    its own timeout.
+    """
+    from playwright.async_api import async_playwright
+
+    total = len(groups)
+    row_timeout = ROW_TIMEOUT_SEC if ROW_TIMEOUT_SEC > 0 else None
+    sem = asyncio.Semaphore(max(1, CONCURRENCY))
+
+    async with async_playwright() as p:
+        browser = None
+        context = None
+        launch_lock = asyncio.Lock()
+
+        async def _get_context():
+            nonlocal browser, context
+            async with launch_lock:
+                if context is None:
+                    browser = await p.chromium.launch(headless=True)
+                    context = await browser.new_context(user_agent=USER_AGENT, accept_downloads=True)
+            return context
+
+        async def _guarded(idx: int, group: List[CsvRow]) -> None:
+            async with sem:
+                deadline = time.monotonic() + row_timeout if row_timeout else None
+                try:
+                    await asyncio.wait_for(
+                        _process_csv_group(group, out_root, _get_context, existing, deadline), timeout=row_timeout
+                    )
+                    print(f"[CSV] ({idx}/{total}) done")
+                except asyncio.TimeoutError:
+                    print(f"[CSV] ({idx}/{total}) TIMEOUT after {row_timeout}s; skipping.")
+                    raise
+                except Exception as e:
+                    print(f"[CSV] ({idx}/{total}) FAILED: {e}")
+                    raise
+
+        try:
+            results = await asyncio.gather(
+                *[_guarded(idx, group) for idx, group in enumerate(groups, 1)],
+                return_exceptions=True,
+            )
+        finally:
+            if context is not None:
+                await context.close()
+            if browser is not None:
+                await browser.close()
+
+    failed = sum(1 for r in results if isinstance(r, BaseException))
+    print(f"[CSV] Batch finished: {total - failed} ok, {failed} failed/timed out")
 
 def run_batch_from_csv(csv_path: Path, out_dir: Path) -> None:
     out_root = out_dir / BATCH_OUT_SUBDIR
     out_root.mkdir(parents=True, exist_ok=True)
 
-    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    rows = _read_csv_rows(csv_path)
 
     if not rows:
         print(f"[CSV] No rows found in {csv_path}")
         return
 
     print(f"[CSV] Loaded {len(rows)} rows from {csv_path}")
+
+    # Skipping is a pure filesystem check; do it up front so re-runs launch nothing.
+    # One directory read instead of a stat() per row.
+    with os.scandir(out_root) as it:
+        existing = {e.name for e in it if e.is_dir()}
+    todo = [r for r in rows if sanitize_filename(r[3]) not in existing]
+    if len(todo) < len(rows):
+        print(f"[CSV] Skipped {len(rows) - len(todo)} already-present posts")
+    rows = todo
+    if not rows:
+        print("[CSV] Nothing to download.")
+        return
+
     max_rows = None
     try:
         max_rows = int(MAX_ROWS) if MAX_ROWS is not None else None
     except Exception:
         max_rows = None
-    row_timeout = ROW_TIMEOUT_SEC if ROW_TIMEOUT_SEC > 0 else None
+    if max_rows is not None and len(rows) > max_rows:
+        print(f"[CSV] MINAS_MAX_ROWS={max_rows}; only the first {max_rows} rows will be processed.")
+        rows = rows[:max_rows]
+
+    # Rows pointing at the same share are downloaded once per batch
+    groups: Dict[Tuple[str, str], List[CsvRow]] = defaultdict(list)
+    for i, row in enumerate(rows):
+        key = (row[1], row[2]) if row[1] and row[2] else (f"#{i}", "")
+        groups[key].append(row)
+    if len(groups) < len(rows):
+        print(f"[CSV] {len(rows)} rows share {len(groups)} distinct links")
 
-    for idx, row in enumerate(rows, 1):
-        if max_rows is not None and idx > max_rows:
-            print(f"[CSV] Reached MINAS_MAX_ROWS={max_rows}; stopping early.")
-            break
-        try:
-            if row_timeout:
-                asyncio.run(asyncio.wait_for(_process_csv_row(row, out_root), timeout=row_timeout))
-            else:
-                asyncio.run(_process_csv_row(row, out_root))
-            print(f"[CSV] ({idx}/{len(rows)}) done")
-        except asyncio.TimeoutError:
-            print(f"[CSV] ({idx}/{len(rows)}) TIMEOUT after {row_timeout}s; skipping.")
-        except KeyboardInterrupt:
-            print("\n[CSV] Aborted by user.")
-            break
-        except Exception as e:
-            print(f"[CSV] ({idx}/{len(rows)}) FAILED: {e}")
+    try:
+        asyncio.run(_run_batch_async(list(groups.values()), out_root, existing))
+    except KeyboardInterrupt:
+        print("\n[CSV] Aborted by user.")
 
 # --------------------- Orchestrator ---------------------
 
@@ -448,7 +840,11 @@ def run(url: str, password: str, out_dir: Path) -> None:
 
     if zip_args.get("zip_one"):
         path = zip_args.get("path") or "/"
-        saved = asyncio.run(_zip_current_path(url, password, path, out_dir))
+        try:
+            saved = _zip_via_api(url, password, path, out_dir)
+        except Exception as e:
+            print(f"API zip failed ({e}); falling back to browser")
+            saved = asyncio.run(_zip_current_path(url, password, path, out_dir))
         print(f"ZIP completed: {saved}")
 
 def main(argv: List[str] | None = None) -> int:
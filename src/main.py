@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 
 from scraper.PostScraper import PostScraper
@@ -5,8 +6,15 @@ from scraper.MinasScraper import MinasScraper
 from downloader.MinasDownloader import run_batch_from_csv
 
 
-PostScraper("米游社-官方资讯").run()
-PostScraper("官网-新闻资讯").run()
+async def scrape_posts() -> None:
+    # independent sources; fetch them side by side
+    await asyncio.gather(
+        PostScraper("米游社-官方资讯").run_async(),
+        PostScraper("官网-新闻资讯").run_async(),
+    )
+
+
+asyncio.run(scrape_posts())
 MinasScraper("米游社-官方资讯-minas").run()
 run_batch_from_csv(
     Path("metafiles/米游社-官方资讯-minas.csv"),
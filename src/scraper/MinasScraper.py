@@ -1,23 +1,80 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Set, Tuple
 from pathlib import Path
+import asyncio
 import csv
 import json
+import logging
+import os
 import re
+import sys
 
 from bs4 import BeautifulSoup
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))  # for src/
 
-# Robust imports so it works when run as a package or module
+# Optional: orjson for faster JSON parsing (stdlib json as fallback)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except Exception:
+    orjson = None  # type: ignore
+    _json_loads = json.loads
+
+# Optional: pyahocorasick, a single automaton for long keyword lists
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None  # type: ignore
+
+# Optional: google-re2, linear-time matching for the URL/password patterns
 try:
-    from ..base.BaseScraper import BaseScraper  # src.scraper.MinasScraper path
-except Exception:  # pragma: no cover
-    try:
-        from src.base.BaseScraper import BaseScraper
-    except Exception:
-        from base.BaseScraper import BaseScraper
+    import re2
+except Exception:
+    re2 = None  # type: ignore
+
+# src/ is the import root (python src/main.py). Only a direct script run of this
+# file needs it added to the path.
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from base.BaseScraper import BaseScraper
+
+
+# --------------------- text scanning ---------------------
+# Plain module functions: the per-blob hot path takes the compiled unions as
+# arguments, with no attribute lookups or method dispatch per call.
+
+def _first_match(union, patterns, text: str):
+    """First hit of ``patterns`` in priority order, like searching pattern by pattern.
+
+    The union is only a one-pass pre-check: most blobs contain nothing and stop
+    there. Its leftmost hit (group "g<rank>") bounds the winner to patterns[0..rank],
+    which are then searched in order. Accepting the union hit directly would let an
+    earlier, lower-ranked match (e.g. a mihoyo redirect URL) swallow a minas link
+    nested inside it.
+    """
+    m = union.search(text)
+    if m is None:
+        return None
+    rank = int(m.lastgroup[1:])
+    for p in patterns[:rank]:
+        hit = p.search(text)
+        if hit:
+            return hit
+    return patterns[rank].search(text)
+
+
+def _password_in(pwd_union, pwd_patterns, text: str) -> str | None:
+    m = _first_match(pwd_union, pwd_patterns, text)
+    return m.group(1) if m else None
+
+
+def _scan_text(text: str, url_union, url_patterns, pwd_union, pwd_patterns) -> Tuple[str | None, str | None]:
+    """(link, pwd) from a text blob; the password is only looked for when a link is found."""
+    m = _first_match(url_union, url_patterns, text)
+    if m is None:
+        return None, None
+    return m.group(0), _password_in(pwd_union, pwd_patterns, text)
 
 
 class MinasScraper(BaseScraper):
@@ -30,6 +87,7 @@ class MinasScraper(BaseScraper):
         "source": "米游社-官方资讯.csv",   # the file under /posts/
         "keyword": ["壁纸", "影像档案"],     # optional; can be string or list
         "type": "minas",
+        "concurrency": 4,                  # optional; posts fetched at once
         "comment": "扫描所有米游社官方资讯的minas链接"
     }
 
@@ -37,6 +95,22 @@ class MinasScraper(BaseScraper):
         post_time, post_name, post_url, minas_link, minas_pwd
     """
 
+    # getPostFull bodies rarely change once published; keep them for a week so
+    # re-runs (e.g. posts still missing a password) are served from the HTTP cache.
+    DEFAULT_CACHE_URLS_EXPIRE_AFTER: Dict[str, Any] = {
+        **BaseScraper.DEFAULT_CACHE_URLS_EXPIRE_AFTER,
+        "bbs-api.miyoushe.com/post/wapi/getPostFull": 7 * 24 * 3600,
+    }
+
+    # Host substrings covering every entry of _url_patterns (anchor pre-filter)
+    _LINK_HINTS = ("minas", "pan.baidu", "lanzou", "189.cn", "123pan", "weiyun", "mihoyo")
+
+    # Chars of parent text around an anchor searched by _password_near
+    NEAR_WINDOW = 512
+
+    # Keyword count from which the Aho-Corasick automaton beats the regex union
+    KW_AUTOMATON_MIN = 8
+
     # --------------------- init ---------------------
     def __init__(self, task_name: str, **kwargs: Any) -> None:
         super().__init__(task_name, **kwargs)
@@ -57,25 +131,59 @@ class MinasScraper(BaseScraper):
             raw_kw = [raw_kw] if raw_kw.strip() else []
         self.keywords: List[str] = [str(k).strip() for k in raw_kw if str(k).strip()]
         self.keywords_lower = [k.lower() for k in self.keywords]
+        # all keywords in one alternation: a single scan per post name; long lists
+        # use an Aho-Corasick automaton when pyahocorasick is installed
+        self._kw_union = (
+            re.compile("|".join(map(re.escape, self.keywords_lower))) if self.keywords_lower else None
+        )
+        self._kw_automaton = None
+        if ahocorasick is not None and len(self.keywords_lower) >= self.KW_AUTOMATON_MIN:
+            automaton = ahocorasick.Automaton()
+            for k in self.keywords_lower:
+                automaton.add_word(k, k)
+            automaton.make_automaton()
+            self._kw_automaton = automaton
+        # bound "lower-cased name -> truthy on hit" callable for the hot filter loop
+        if self._kw_automaton is not None:
+            self._kw_search = lambda s, _iter=self._kw_automaton.iter: next(_iter(s), None)
+        elif self._kw_union is not None:
+            self._kw_search = self._kw_union.search
+        else:
+            self._kw_search = None
 
         # compile patterns once
         self._mihoyo_post_id = re.compile(r"/zzz/article/(\d+)")
-        self._url_patterns = [
-            re.compile(r"https?://minas\.mihoyo\.com/\S+", re.I),
-            re.compile(r"https?://pan\.baidu\.com/s/[a-zA-Z0-9\-_=]+", re.I),
-            re.compile(r"https?://(www\.)?lanzou[inx]?\.com/[a-zA-Z0-9\-_]+", re.I),
-            re.compile(r"https?://cloud\.189\.cn/t/[a-zA-Z0-9]+", re.I),
-            re.compile(r"https?://(www\.)?123pan\.com/s/[a-zA-Z0-9\-_]+", re.I),
-            re.compile(r"https?://share\.weiyun\.com/[a-zA-Z0-9]+", re.I),
-            re.compile(r"https?://[\w\-\.]*mihoyo\.[\w\.]+/\S+", re.I),
-            re.compile(r"https?://\S*minas\S+", re.I),
+        url_sources = [
+            r"https?://minas\.mihoyo\.com/\S+",
+            r"https?://pan\.baidu\.com/s/[a-zA-Z0-9\-_=]+",
+            r"https?://(?:www\.)?lanzou[inx]?\.com/[a-zA-Z0-9\-_]+",
+            r"https?://cloud\.189\.cn/t/[a-zA-Z0-9]+",
+            r"https?://(?:www\.)?123pan\.com/s/[a-zA-Z0-9\-_]+",
+            r"https?://share\.weiyun\.com/[a-zA-Z0-9]+",
+            r"https?://[\w\-\.]*mihoyo\.[\w\.]+/\S+",
+            r"https?://\S*minas\S+",
         ]
-        self._pwd_patterns = [
-            re.compile(r"提取码[:：\s]*([a-zA-Z0-9]{3,20})"),
-            re.compile(r"密码[:：\s]*([a-zA-Z0-9]{3,20})"),
-            re.compile(r"访问码[:：\s]*([a-zA-Z0-9]{3,20})"),
-            re.compile(r"pass(code)?[:：\s]*([a-zA-Z0-9]{3,20})", re.I),
+        pwd_sources = [
+            r"提取码[:：\s]*([a-zA-Z0-9]{3,20})",
+            r"密码[:：\s]*([a-zA-Z0-9]{3,20})",
+            r"访问码[:：\s]*([a-zA-Z0-9]{3,20})",
+            r"pass(?:code)?[:：\s]*([a-zA-Z0-9]{3,20})",
         ]
+        # Per-pattern regexes go through the same engine as the unions, so the
+        # priority re-check in _first_match is linear-time under RE2 as well.
+        self._url_patterns = [self._compile_union(p) for p in url_sources]
+        self._pwd_patterns = [self._compile_union(p) for p in pwd_sources]
+        # One alternation per list, so a blob without any hit is scanned once
+        # instead of once per pattern. Group "g<i>" marks which pattern matched;
+        # the list order is still the priority order (see _first_match).
+        # cheap check for "is there any password label around this anchor?"
+        self._pwd_hint = re.compile(r"提取码|密码|访问码|pass", re.I)
+        self._url_union = self._compile_union(
+            "|".join(f"(?P<g{i}>{p})" for i, p in enumerate(url_sources))
+        )
+        self._pwd_union = self._compile_union(
+            "|".join(f"(?P<g{i}>{p})" for i, p in enumerate(pwd_sources))
+        )
 
     # --------------------- public API ---------------------
     def run(self) -> None:
@@ -85,102 +193,144 @@ class MinasScraper(BaseScraper):
 
 
         # load existing results to merge/skip
-        existing_map = self._load_existing_map(self.out_csv)
+        existing_map, complete_urls = self._load_existing_map(self.out_csv)
 
         # read posts
         rows: List[Dict[str, str]] = []
         with open(self.source_csv, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            i_time, i_name, i_url = self._column_indexes(next(reader, []), "post_time", "post_name", "post_url")
+            _cell = self._cell
             for r in reader:
+                if not r:
+                    continue  # blank line
                 rows.append({
-                    "post_time": (r.get("post_time") or "").strip(),
-                    "post_name": (r.get("post_name") or "").strip(),
-                    "post_url":  (r.get("post_url")  or "").strip(),
+                    "post_time": _cell(r, i_time),
+                    "post_name": _cell(r, i_name),
+                    "post_url":  _cell(r, i_url),
                 })
 
         # stop_on_seen: if True, stop processing after first seen (cached) entry
         stop_on_seen = bool(self.task.get("stop_on_seen", False))
-        seen_cached = False
 
-        results: List[Dict[str, str]] = []
+        # Filtering and cache lookups are cheap; do them up front in separate
+        # passes so only posts that really need the network get scheduled.
         total = len(rows)
-        for idx, row in enumerate(rows, start=1):
-            url = row.get("post_url")
-            if not url:
-                continue
 
-            cached = existing_map.get(url, {})
-
-            # keyword pre-filter — do not write non-matching posts to metafile
-            if not self._matches_keywords(row.get("post_name", "")):
-                self.log.info(f"[{idx}/{total}] skip (keyword): {row.get('post_time','')} | {row.get('post_name','')}")
-                continue
-
-            # if we already have both, keep and skip network
-            if cached.get("minas_link") and cached.get("minas_pwd"):
-                results.append(self._merge_cached(row, cached))
-                self.log.info(f"[{idx}/{total}] skip (cached): {row.get('post_time','')} | {row.get('post_name','')}")
+        # 1) keyword pre-filter — do not write non-matching posts to metafile
+        kw_search = self._kw_search  # None: no keyword filter
+        to_process = [
+            (idx, row) for idx, row in enumerate(rows, start=1)
+            if row["post_url"] and (kw_search is None or kw_search(row["post_name"].lower()))
+        ]
+        if len(to_process) < total:
+            self.log.info(f"skip (keyword/no url): {total - len(to_process)} of {total} posts")
+
+        # 2) cached-complete rows are emitted as-is; the rest need the network
+        results: List[Dict[str, str] | None] = []
+        pending: List[Tuple[int, int, Dict[str, str], Dict[str, str]]] = []
+        verbose = self.log.isEnabledFor(logging.INFO)  # skip f-string work when INFO is off
+        for idx, row in to_process:
+            url = row["post_url"]
+            if url in complete_urls:
+                results.append(self._merge_cached(row, existing_map[url]))
+                if verbose:
+                    self.log.info(f"[{idx}/{total}] skip (cached): {row['post_time']} | {row['post_name']}")
                 if stop_on_seen:
-                    seen_cached = True
                     break
                 continue
-
+            pending.append((len(results), idx, row, existing_map.get(url, {})))
+            results.append(None)  # filled in by _process_post, keeps CSV order
+
+        # 3) network fetch for the remainder, concurrently
+        if pending:
+            asyncio.run(self._process_pending(pending, results, total))
+
+        self._write_csv([r for r in results if r is not None])
+
+    async def _process_pending(
+        self,
+        pending: List[Tuple[int, int, Dict[str, str], Dict[str, str]]],
+        results: List[Dict[str, str] | None],
+        total: int,
+    ) -> None:
+        """Fetch posts concurrently, at most ``concurrency`` (task/config, default 4) at a time."""
+        limit = int(self.task.get("concurrency") or self.config.get("concurrency") or 4)
+        sem = asyncio.Semaphore(max(1, limit))
+
+        async def _one(slot: int, idx: int, row: Dict[str, str], cached: Dict[str, str]) -> None:
+            async with sem:
+                results[slot] = await self._process_post(idx, total, row, cached)
+
+        await asyncio.gather(*[_one(*p) for p in pending])
+
+    async def _process_post(
+        self, idx: int, total: int, row: Dict[str, str], cached: Dict[str, str]
+    ) -> Dict[str, str]:
+        url = row["post_url"]
+        verbose = self.log.isEnabledFor(logging.INFO)
+        if verbose:
             self.log.info(f"[{idx}/{total}] check: {row.get('post_time','')} | {row.get('post_name','')} | {url}")
 
-            minas_link = cached.get("minas_link") or ""
-            minas_pwd  = cached.get("minas_pwd")  or ""
-
-            # 0) Miyoushe API fast path for /zzz/article/<id>
-            m = self._mihoyo_post_id.search(url)
-            if m:
-                pid = m.group(1)
-                api_link, api_pwd = self._extract_via_miyoushe_api(pid)
-                if api_link:
-                    minas_link = api_link
-                    minas_pwd = minas_pwd or api_pwd or ""
-                    self.log.info(f"    -> api: link found ({'pwd ok' if api_pwd else 'no pwd'})")
-
-            # 1) Fallback to HTML only if still missing link
-            soup = None
-            if not minas_link:
-                soup = self.get_soup(url)
-                ml, mp = self._extract_from_soup(soup)
+        minas_link = cached.get("minas_link") or ""
+        minas_pwd  = cached.get("minas_pwd")  or ""
+
+        # 0) Miyoushe API fast path for /zzz/article/<id>
+        m = self._mihoyo_post_id.search(url)
+        if m:
+            pid = m.group(1)
+            api_link, api_pwd = await self._extract_via_miyoushe_api(pid)
+            if api_link:
+                minas_link = api_link
+                minas_pwd = minas_pwd or api_pwd or ""
+                self.log.info(f"    -> api: link found ({'pwd ok' if api_pwd else 'no pwd'})")
+
+        # 1) Fallback to HTML only if still missing link
+        soup = None
+        text = None  # soup.get_text(), computed at most once per post
+        page_tried = False
+        if not minas_link:
+            page_tried = True
+            try:
+                soup = await self.aget_soup(url)
+            except Exception as e:
+                self.log.info(f"    -> page fetch failed: {e}")
+            if soup is not None:
+                ml, mp, text = self._extract_from_soup(soup)
                 if ml:
                     minas_link = ml
                     minas_pwd = minas_pwd or mp or ""
 
-            # 2) Fallback to raw text only if anything still missing
-            if (not minas_link) or (not minas_pwd):
-                if soup is None:
-                    try:
-                        soup = self.get_soup(url)
-                    except Exception:
-                        soup = None
-                if soup is not None:
+        # 2) Fallback to raw text only if anything still missing
+        if (not minas_link) or (not minas_pwd):
+            if soup is None and not page_tried:
+                try:
+                    soup = await self.aget_soup(url)
+                except Exception:
+                    soup = None
+            if soup is not None:
+                if text is None:
                     text = soup.get_text("\n", strip=False)
-                    tl, tp = self._extract_from_text(text)
-                    minas_link = minas_link or tl or ""
-                    minas_pwd = minas_pwd or tp or ""
-
-            results.append({
-                **row,
-                "minas_link": minas_link,
-                "minas_pwd": minas_pwd,
-            })
+                tl, tp = self._extract_from_text(text)
+                minas_link = minas_link or tl or ""
+                minas_pwd = minas_pwd or tp or ""
+
+        if verbose:
             if minas_link:
                 self.log.info(f"    -> found: {minas_link}  pwd: {minas_pwd or '-'}")
             else:
                 self.log.info("    -> no minas link")
-            self._sleep()
-
-        self._write_csv(results)
+        return {
+            **row,
+            "minas_link": minas_link,
+            "minas_pwd": minas_pwd,
+        }
 
     # --------------------- extraction helpers ---------------------
     def _matches_keywords(self, name: str) -> bool:
-        if not self.keywords_lower:
+        if self._kw_search is None:
             return True
-        s = (name or "").lower()
-        return any(k in s for k in self.keywords_lower)
+        return self._kw_search((name or "").lower()) is not None
 
     def _merge_cached(self, row: Dict[str, str], cached: Dict[str, str]) -> Dict[str, str]:
         return {
@@ -191,69 +341,81 @@ class MinasScraper(BaseScraper):
             "minas_pwd":  (cached or {}).get("minas_pwd",  ""),
         }
 
-    def _extract_from_soup(self, soup: BeautifulSoup) -> Tuple[str | None, str | None]:
+    @staticmethod
+    def _compile_union(pattern: str):
+        """Case-insensitive regex (a union or one of its patterns); RE2 when installed
+        (no catastrophic backtracking on huge pages), stdlib re otherwise or if RE2 rejects it."""
+        pattern = "(?i)" + pattern
+        if re2 is not None:
+            try:
+                return re2.compile(pattern)
+            except Exception:
+                pass
+        return re.compile(pattern)
+
+    def _search_password(self, text: str) -> str | None:
+        """First password captured in ``text``, honoring _pwd_patterns priority."""
+        return _password_in(self._pwd_union, self._pwd_patterns, text)
+
+    def _extract_from_soup(self, soup: BeautifulSoup) -> Tuple[str | None, str | None, str | None]:
+        """(link, pwd, text); ``text`` is the page text when it had to be computed."""
         link = None
         pwd = None
         # anchors first
         for a in soup.select('a[href]'):
             href = (a.get('href') or '').strip()
-            if not href:
+            # every URL pattern needs "http" plus one of these hosts; plain
+            # substring tests weed out ordinary links before the regex runs
+            h = href.lower()
+            if "http" not in h or not any(k in h for k in self._LINK_HINTS):
                 continue
-            for up in self._url_patterns:
-                m = up.search(href)
-                if m:
-                    link = m.group(0)
-                    pwd = pwd or self._password_near(a)
-                    if link and pwd:
-                        return link, pwd
+            m = _first_match(self._url_union, self._url_patterns, href)
+            if m:
+                link = m.group(0)
+                if not pwd:
+                    # neighbour walk only when the surrounding block mentions a password;
+                    # otherwise the full-text pass below picks it up anyway
+                    parent_text = a.parent.get_text(" ", strip=True) if a.parent else ""
+                    if self._pwd_hint.search(parent_text):
+                        pwd = self._password_near(a, parent_text)
+                if link and pwd:
+                    return link, pwd, None
         # then full text
         text = soup.get_text("\n", strip=False)
-        return self._extract_from_text(text)
+        return (*self._extract_from_text(text), text)
 
     def _extract_from_text(self, text: str) -> Tuple[str | None, str | None]:
-        link = None
-        pwd = None
-        for up in self._url_patterns:
-            m = up.search(text)
-            if m:
-                link = m.group(0)
+        return _scan_text(text, self._url_union, self._url_patterns, self._pwd_union, self._pwd_patterns)
+
+    def _password_near(self, a_tag, parent_text: str | None = None) -> str | None:
+        """Password in the text around an anchor: its parent, then grandparent,
+        each cut to a window of NEAR_WINDOW chars centred on the anchor text."""
+        anchor_text = a_tag.get_text(" ", strip=True) or ""
+        node = a_tag.parent
+        for depth in range(2):
+            if node is None:
                 break
-        if link:
-            for pp in self._pwd_patterns:
-                m2 = pp.search(text)
-                if m2:
-                    # pick first non-empty captured group
-                    for g in m2.groups():
-                        if g:
-                            pwd = g
-                            break
-                    break
-        return link, pwd
-
-    def _password_near(self, a_tag) -> str | None:
-        candidates: List[str] = []
-        try:
-            candidates.append(a_tag.get_text(" ", strip=True) or "")
-            if a_tag.parent:
-                candidates.append(a_tag.parent.get_text(" ", strip=True) or "")
-            prev = a_tag.find_previous(string=True)
-            if prev:
-                candidates.append(str(prev))
-            nxt = a_tag.find_next(string=True)
-            if nxt:
-                candidates.append(str(nxt))
-        except Exception:
-            pass
-        blob = "\n".join(candidates)
-        for pp in self._pwd_patterns:
-            m = pp.search(blob)
-            if m:
-                for g in m.groups():
-                    if g:
-                        return g
+            try:
+                text = parent_text if (depth == 0 and parent_text is not None) else node.get_text(" ", strip=True)
+            except Exception:
+                break
+            pwd = self._search_password(self._window(text, anchor_text))
+            if pwd:
+                return pwd
+            node = node.parent
         return None
 
-    def _extract_via_miyoushe_api(self, post_id: str) -> Tuple[str | None, str | None]:
+    @classmethod
+    def _window(cls, text: str, anchor_text: str) -> str:
+        if len(text) <= cls.NEAR_WINDOW:
+            return text
+        half = cls.NEAR_WINDOW // 2
+        i = text.find(anchor_text) if anchor_text else -1
+        center = i + len(anchor_text) // 2 if i >= 0 else len(text) // 2
+        start = max(0, center - half)
+        return text[start:start + cls.NEAR_WINDOW]
+
+    async def _extract_via_miyoushe_api(self, post_id: str) -> Tuple[str | None, str | None]:
         api = "https://bbs-api.miyoushe.com/post/wapi/getPostFull"
         params = {"gids": 8, "post_id": post_id, "read": 1}
         headers = {
@@ -266,86 +428,133 @@ class MinasScraper(BaseScraper):
         if ds:
             headers["DS"] = ds
         try:
-            resp = self.fetch(api, params=params, headers=headers)
+            resp = await self.afetch(api, params=params, headers=headers)
             if getattr(resp, 'status_code', 200) in (403, 404):
                 self.log.info(f"API blocked or not found ({resp.status_code}) for post {post_id}")
-            data = resp.json()
+            data = _json_loads(resp.content)
         except Exception as e:
             self.log.info(f"API getPostFull failed for {post_id}: {e}")
             return None, None
 
         post = (((data or {}).get("data") or {}).get("post") or {}).get("post") or {}
         if not post:
+            self._forget_cached(resp)  # don't pin an error/blocked payload for a week
             return None, None
 
-        blobs: List[str] = []
+        # Common case: link (and usually the password) sit in the HTML content;
+        # structured_content is only decoded when something is still missing.
         html_content = post.get("content") or ""
+        link, pwd = self._extract_from_text(html_content) if html_content else (None, None)
+        if link and pwd:
+            return link, pwd
+
+        pieces = self._structured_pieces(post.get("structured_content") or "")
+        if not pieces:
+            return link, pwd
+        if link:
+            # the HTML had no password, so only the structured text can add one
+            return link, self._search_password("\n".join(pieces))
         if html_content:
-            blobs.append(html_content)
-        struct_raw = post.get("structured_content") or ""
-        if struct_raw:
+            pieces.insert(0, html_content)
+        return self._extract_from_text("\n".join(pieces))
+
+    @staticmethod
+    def _structured_pieces(struct_raw: str) -> List[str]:
+        """Text inserts and link targets from a post's structured_content ops."""
+        pieces: List[str] = []
+        if not struct_raw:
+            return pieces
+        try:
+            for op in _json_loads(struct_raw):
+                ins = op.get("insert")
+                if isinstance(ins, str):
+                    pieces.append(ins)
+                attrs = op.get("attributes") or {}
+                if isinstance(attrs, dict):
+                    lnk = attrs.get("link")
+                    if lnk:
+                        pieces.append(str(lnk))
+        except Exception:
+            pass
+        return pieces
+
+    def _forget_cached(self, resp) -> None:
+        cache = getattr(self.session, "cache", None)  # only on requests_cache sessions
+        if cache is not None:
             try:
-                ops = json.loads(struct_raw)
-                for op in ops:
-                    ins = op.get("insert")
-                    if isinstance(ins, str):
-                        blobs.append(ins)
-                    attrs = op.get("attributes") or {}
-                    if isinstance(attrs, dict):
-                        lnk = attrs.get("link")
-                        if lnk:
-                            blobs.append(str(lnk))
+                cache.delete(requests=[resp.request])
             except Exception:
                 pass
 
-        big_text = "\n".join(blobs)
-        link, pwd = self._extract_from_text(big_text)
-        return link, pwd
-
     # --------------------- IO helpers ---------------------
-    def _load_existing_map(self, path: Path) -> Dict[str, Dict[str, str]]:
+    @staticmethod
+    def _column_indexes(header: List[str], *names: str) -> List[int | None]:
+        """Position of each named column in a CSV header (None when absent)."""
+        pos = {name: i for i, name in enumerate(header)}
+        return [pos.get(n) for n in names]
+
+    @staticmethod
+    def _cell(row: List[str], i: int | None) -> str:
+        return row[i].strip() if i is not None and i < len(row) else ""
+
+    def _load_existing_map(self, path: Path) -> Tuple[Dict[str, Dict[str, str]], Set[str]]:
+        """(post_url -> cached link/pwd, URLs that have both). Rows with neither are
+        left out: for run() they are the same as an unseen post."""
         out: Dict[str, Dict[str, str]] = {}
+        complete: Set[str] = set()
         if not path.exists():
-            return out
+            return out, complete
         try:
             with open(path, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
+                reader = csv.reader(f)
+                i_url, i_link, i_pwd = self._column_indexes(next(reader, []), "post_url", "minas_link", "minas_pwd")
+                _cell = self._cell
                 for r in reader:
-                    url = (r.get("post_url") or "").strip()
-                    if url:
-                        out[url] = {
-                            "minas_link": (r.get("minas_link") or "").strip(),
-                            "minas_pwd":  (r.get("minas_pwd")  or "").strip(),
-                        }
+                    url = _cell(r, i_url)
+                    link = _cell(r, i_link)
+                    pwd = _cell(r, i_pwd)
+                    if url and (link or pwd):
+                        out[url] = {"minas_link": link, "minas_pwd": pwd}
+                        if link and pwd:
+                            complete.add(url)
+                        else:
+                            complete.discard(url)  # a later partial row wins, as in the map
         except Exception:
             pass
-        return out
+        return out, complete
 
     def _write_csv(self, rows: List[Dict[str, str]]) -> None:
         self.out_csv.parent.mkdir(parents=True, exist_ok=True)
         fieldnames = ["post_time", "post_name", "post_url", "minas_link", "minas_pwd"]
 
-        # Load existing rows
-        existing: List[Dict[str, str]] = []
-        if self.out_csv.exists():
-            try:
-                with open(self.out_csv, "r", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    for r in reader:
-                        existing.append({k: r.get(k, "") for k in fieldnames})
-            except Exception:
-                pass
-
-        # De-dup by URL: new rows first, then existing rows not in new
+        # De-dup by URL: new rows first, then existing rows not in new.
+        # Existing rows are streamed from the old file into a temp file that
+        # replaces it atomically, so a crash mid-write keeps the old metafile.
         new_urls = {(r.get("post_url") or "").strip() for r in rows if (r.get("post_url") or "").strip()}
-        merged_rows = rows + [r for r in existing if (r.get("post_url") or "").strip() not in new_urls]
-
-        with open(self.out_csv, "w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=fieldnames)
-            w.writeheader()
-            for r in merged_rows:
-                w.writerow({k: r.get(k, "") for k in fieldnames})
-        self.log.info(f"wrote CSV: {self.out_csv} (rows: {len(merged_rows)})")
+        tmp = self.out_csv.with_name(self.out_csv.name + ".tmp")
+        count = 0
+        try:
+            with open(tmp, "w", newline="", encoding="utf-8") as f:
+                w = csv.DictWriter(f, fieldnames=fieldnames)
+                w.writeheader()
+                for r in rows:
+                    w.writerow({k: r.get(k, "") for k in fieldnames})
+                    count += 1
+                if self.out_csv.exists():
+                    try:
+                        with open(self.out_csv, "r", encoding="utf-8") as old:
+                            for r in csv.DictReader(old):
+                                if (r.get("post_url") or "").strip() in new_urls:
+                                    continue
+                                w.writerow({k: r.get(k, "") or "" for k in fieldnames})
+                                count += 1
+                    except Exception:
+                        pass
+            os.replace(tmp, self.out_csv)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        self.log.info(f"wrote CSV: {self.out_csv} (rows: {count})")
 
 if __name__ == "__main__":
     MinasScraper("米游社-官方资讯-minas").run()
\ No newline at end of file
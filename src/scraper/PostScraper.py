@@ -1,36 +1,232 @@
 from __future__ import annotations
 
+import asyncio
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Set, Tuple
-from urllib.parse import urljoin, urlparse, parse_qs
-from datetime import datetime
+import functools
+import itertools
+from typing import Any, Dict, Iterable, List, NamedTuple, Set, Tuple
+from urllib.parse import urljoin, urlparse, urlsplit, urlunparse, urlencode, parse_qs
+import time
 import re
 import json
+import logging
+import os
 from pathlib import Path
 import csv
 
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))  # for src/
+
+# src/ is the import root (python src/main.py). Only a direct script run of this
+# file needs it added to the path.
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 # Optional: requests_html for JS-rendered pages
-HTMLSession = None  # type: ignore
+AsyncHTMLSession = None  # type: ignore
 try:
-    from requests_html import HTMLSession as _HTMLSession  # optional, for JS-rendered pages
-    HTMLSession = _HTMLSession
+    from requests_html import AsyncHTMLSession as _AsyncHTMLSession  # optional, for JS-rendered pages
+    AsyncHTMLSession = _AsyncHTMLSession
 except Exception as _e:  # keep going; we will try importing lazily too
     import logging as _logging
     _logging.getLogger("PostScraper").info(f"requests_html import failed: {_e}")
 
-# Robust import to work whether package is run as module or script
+# Optional: orjson for faster JSON parsing (stdlib json as fallback)
 try:
-    from .BaseScraper import BaseScraper  # package-relative (src/scraper)
+    import orjson
+    _json_loads = orjson.loads
 except Exception:
+    orjson = None  # type: ignore
+    _json_loads = json.loads
+
+# Optional: ijson to stream very large embedded JSON islands
+try:
+    import ijson
+except Exception:
+    ijson = None  # type: ignore
+
+from base.BaseScraper import BaseScraper
+
+
+@functools.lru_cache(maxsize=256)
+def _css(selector: str) -> soupsieve.SoupSieve:
+    """Compile a CSS selector once; reused across pages (task.json selectors too)."""
+    return soupsieve.compile(selector)
+
+
+# Built-in selectors, compiled at import
+_ARTICLE_ANCHORS = _css('article a[href]')
+_HREF_ANCHOR = _css('a[href]')
+_NEWS_ANCHORS = _css('li a[href], .article-list a[href], .news-list a[href], .news__list a[href]')
+_NEWS_TIME = _css('.time, .date, time')
+_NEWS_CARDS = _css('.news-list li, .news__list li, .article-list li, li.news-item, article, .news-list__item')
+_NEWS_PATH_ANCHORS = _css('a[href^="/news/"]')
+_NEWS_DATE = _css('time, .time, .date, .news__date, .news-item__date, .list-date, .date__text')
+_NEXT_LINKS = _css('a[rel="next"], a.next, .next a, .pager a.next, .pagination a.next')
+_ACTIVE_PAGE = _css('.pagination .active, .pager .active, .page-item.active, .active > a')
+_PAGE_LINKS = _css('.pagination a, .pager a, a.page-link, a')
+
+
+# embedded-JSON pages only need their <script> tags parsed
+_SCRIPTS_ONLY = SoupStrainer('script')
+
+_NEWS_ID_RE = re.compile(r"/news/\d+")
+# plausible epoch seconds for a post (2000-01-01 .. 2100-01-01)
+_TS_MIN, _TS_MAX = 946684800, 4102444800
+
+
+def _utc_stamp(ts: int) -> str:
+    """'%Y-%m-%d %H:%M:%S' in UTC, without datetime/strftime."""
+    y, mo, d, h, mi, sec = time.gmtime(ts)[:6]
+    return f"{y:04d}-{mo:02d}-{d:02d} {h:02d}:{mi:02d}:{sec:02d}"
+
+
+@functools.lru_cache(maxsize=64)
+def _origin(base: str) -> str:
+    p = urlsplit(base)
+    return f"{p.scheme}://{p.netloc}" if p.scheme and p.netloc else ""
+
+
+def _abs_url(base: str, href: str) -> str:
+    """urljoin() with fast paths for the common absolute and root-relative hrefs."""
+    if href.startswith(("https://", "http://")):
+        return href
+    if href.startswith("/") and not href.startswith("//") and "/." not in href:
+        origin = _origin(base)
+        if origin:
+            return origin + href
+    return urljoin(base, href)
+
+
+_BLOCK_MAX = 2_000_000
+# date fields tried (in order) on embedded-JSON items
+_WHEN_KEYS = ('time', 'date', 'created_at', 'publish_time', 'pub_time')
+_OPEN_BRACKET = re.compile(r"[{\[]")
+# islands at least this big are streamed through ijson (when installed)
+_STREAM_MIN = 64 * 1024
+# events an island must parse cleanly before it is trusted to the stream
+_STREAM_PROBE = 32
+_ITEM_KEYS = frozenset(('title', 'name', 'href', 'url') + _WHEN_KEYS)
+_SCALAR_EVENTS = frozenset(('string', 'number', 'integer', 'double', 'boolean', 'null'))
+
+
+def _block_end(text: str, start: int) -> int:
+    """Index just past the bracket block opening at text[start], or -1 if unbalanced.
+
+    Single pass; brackets inside "..." / '...' strings (with escapes) are ignored.
+    """
+    depth = 0
+    quote = ''
+    i, n = start, len(text)
+    while i < n:
+        ch = text[i]
+        if quote:
+            if ch == '\\':
+                i += 1
+            elif ch == quote:
+                quote = ''
+        elif ch == '"' or ch == "'":
+            quote = ch
+        elif ch == '{' or ch == '[':
+            depth += 1
+        elif ch == '}' or ch == ']':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        elif ch == '<' or ch == '>':
+            # same cut-off as the old [^<>] scan: markup means it's not a JSON literal
+            return -1
+        i += 1
+    return -1
+
+
+def _json_blocks(text: str) -> Iterable[str]:
+    """Top-level {...} / [...] blocks in text, left to right."""
+    i = 0
+    while True:
+        m = _OPEN_BRACKET.search(text, i)
+        if not m:
+            return
+        end = _block_end(text, m.start())
+        if end < 0:
+            i = m.start() + 1
+            continue
+        yield text[m.start():end]
+        i = end
+
+
+def _assigned_literal(text: str, anchor: str) -> str | None:
+    """Source of the literal assigned right after `anchor` (e.g. `window.__NUXT__=`), or None."""
+    at = text.find(anchor)
+    if at < 0:
+        return None
+    eq = text.find('=', at + len(anchor))
+    if eq < 0:
+        return None
+    m = _OPEN_BRACKET.search(text, eq + 1)
+    if not m or text[eq + 1:m.start()].strip():
+        # not a plain literal (e.g. an IIFE); leave it to the block scan
+        return None
+    end = _block_end(text, m.start())
+    return text[m.start():end] if end > 0 else None
+
+
+class _TextReader:
+    """Binary file-like view of a str for ijson: encodes one read() chunk at a time
+    instead of a full UTF-8 copy of the island."""
+
+    def __init__(self, text: str):
+        self._text = text
+        self._pos = 0
+
+    def read(self, n: int = -1) -> bytes:
+        end = len(self._text) if n is None or n < 0 else self._pos + n
+        chunk = self._text[self._pos:end]
+        self._pos += len(chunk)
+        return chunk.encode('utf-8')
+
+
+def _stream_ok(text: str) -> bool:
+    """Cheap validity probe: the island's first few ijson events parse without error
+    (rules out e.g. JS object literals with bare keys before deferring to the stream)."""
     try:
-        from src.base.BaseScraper import BaseScraper  # absolute within src
+        for _ in itertools.islice(ijson.parse(_TextReader(text)), _STREAM_PROBE):
+            pass
+        return True
     except Exception:
-        from BaseScraper import BaseScraper  # same-folder fallback
+        return False
+
+
+def _stream_items(text: str) -> Iterable[Tuple[Any, Any, Any]]:
+    """(title, href, when) of each object in a large JSON island, from ijson events.
+
+    No parsed tree is built: besides the island string itself, only one read
+    chunk and the item fields of the currently open objects are held.
+    """
+    open_maps: List[Dict[str, Any]] = []
+    for prefix, event, value in ijson.parse(_TextReader(text)):
+        if event == 'start_map':
+            open_maps.append({})
+        elif event == 'end_map':
+            cur = open_maps.pop()
+            title = cur.get('title') or cur.get('name')
+            href = cur.get('href') or cur.get('url')
+            if title and href:
+                yield title, href, next((cur[k] for k in _WHEN_KEYS if k in cur), '')
+        elif open_maps and event in _SCALAR_EVENTS:
+            key = prefix.rpartition('.')[2]
+            if key in _ITEM_KEYS:
+                open_maps[-1][key] = value
+
+
+class PostRow(NamedTuple):
+    """One listing entry, in posts CSV column order."""
+    post_time: str
+    post_name: str
+    post_url: str
 
 
 @dataclass
@@ -55,18 +251,32 @@ class PostScraper(BaseScraper):
         "max_pages": 1,  # <=0 means unlimited (generic path)
         "page_size": 20, # for MiYoUShe API
         "stop_on_seen": true,
+        "concurrency": 4, # official API pages fetched ahead when max_pages > 0
         "selectors": {"item": "...", "title": "...", "href": "a", "time": ".date"},
         "pagination": {"param": "page", "start": 1, "stop": 3},
         "keyword": "optional substring filter"
       }
     """
 
+    # tried in this order; the first to return rows wins for later pages
+    _ITEM_EXTRACTORS = (
+        "_extract_by_task_selectors",
+        "_try_mihoyo_news",
+        "_extract_from_embedded_json",
+        "_extract_article_anchors",
+    )
+    _PAGER_STRATEGIES = ("_next_by_rel", "_next_by_number", "_next_by_text")
+
     def __init__(self, task_name: str, **kwargs: Any) -> None:
         super().__init__(task_name, **kwargs)
         t = self.task
         self.source_url: str = t.get("source_url") or t.get("url") or t.get("source")
         if not self.source_url:
             raise ValueError("Task must define 'source_url'/'url'/'source'.")
+        # facts about the source URL, worked out once instead of per call/page
+        self._source_is_miyoushe: bool = self._is_miyoushe(self.source_url)
+        self._source_is_mihoyo_official: bool = self._is_mihoyo_official(self.source_url)
+        self._page_sep: str = '&' if ('?' in self.source_url) else '?'
         self.max_pages: int = int(t.get("max_pages", 1))
         self.pagination: Dict[str, Any] = t.get("pagination", {}) if isinstance(t.get("pagination", {}), dict) else {}
         sel = t.get("selectors", {}) if isinstance(t.get("selectors", {}), dict) else {}
@@ -78,6 +288,10 @@ class PostScraper(BaseScraper):
                 href=sel.get("href", "a"),
                 time=sel.get("time"),
             )
+            # compile up front so a bad selector fails here, not mid-pagination
+            for css in (self.selectors.item, self.selectors.title, self.selectors.href, self.selectors.time):
+                if css:
+                    _css(css)
         # optional keyword filter from task.json
         self.keyword: str = str(t.get("keyword") or "").strip()
         # MiYoUShe paging & dedupe behavior
@@ -87,33 +301,45 @@ class PostScraper(BaseScraper):
         self.mhy_api_url: str = t.get("mhy_api_url", "https://api-takumi-static.mihoyo.com/content_v2_user/app/706fd13a87294881/getContentList")
         self.mhy_channel_id: int = int(t.get("mhy_channel_id", 273))
         self.mhy_lang: str = t.get("mhy_lang", "zh-cn")
+        # requests_html session (and its Chromium), created on first render and reused
+        self._html_session: Any = None
+        # which extractor / pager strategy matched this site (see _extract_items, _find_next_page_url)
+        self._item_extractor: str | None = None
+        self._pager_strategy: str | None = None
 
     # -------------------- public API --------------------
     def run(self) -> None:
+        asyncio.run(self.run_async())
+
+    async def run_async(self) -> None:
+        """run() as a coroutine, so several scrapers can share one event loop."""
         existing_urls = self._load_existing_urls()
         # MiYoUShe pages are app-driven; use official API instead of HTML
-        if self._is_miyoushe(self.source_url):
-            rows = self._extract_miyoushe_forum(self.source_url, existing_urls)
+        if self._source_is_miyoushe:
+            rows = await self._extract_miyoushe_forum(self.source_url, existing_urls)
             rows = self._apply_keyword_filter(rows)
             self._write_posts_csv(rows, existing_urls)
             return
 
         # Official website (zzz.mihoyo.com/news) has numbered pages
-        if self._is_mihoyo_official(self.source_url):
+        if self._source_is_mihoyo_official:
             # Prefer fast JSON API if available; fall back to DOM/rendering
-            rows = self._extract_mihoyo_official_news_api(existing_urls)
+            rows = await self._extract_mihoyo_official_news_api(existing_urls)
             if not rows:
-                rows = self._extract_mihoyo_official_news(self.source_url, existing_urls)
+                try:
+                    # stays on the loop: pyppeteer needs it (and the main thread) to render
+                    rows = await self._extract_mihoyo_official_news(self.source_url, existing_urls)
+                finally:
+                    await self.aclose()
             if not rows:
                 self.log.info(f"no items extracted from {self.source_url}; check selectors/pagination/api")
             rows = self._apply_keyword_filter(rows)
             self._write_posts_csv(rows, existing_urls)
             return
 
-        rows: List[Dict[str, str]] = []
+        rows: List[PostRow] = []
         for page_idx, page_url in enumerate(self._iter_page_urls(), start=1):
-            soup = self.get_soup(page_url)
-            items = self._extract_items(soup, base=page_url)
+            items = await self._page_items(page_url)
             if not items:
                 if not self.pagination or self.pagination.get("stop") is None:
                     break
@@ -134,56 +360,87 @@ class PostScraper(BaseScraper):
         param = pag.get("param", "page")
         i = start
         while True:
-            sep = '&' if ('?' in self.source_url) else '?'
-            yield f"{self.source_url}{sep}{param}={i}"
+            yield f"{self.source_url}{self._page_sep}{param}={i}"
             if stop is not None and i >= int(stop):
                 break
             i += 1
 
-    def _extract_items(self, soup: BeautifulSoup, *, base: str) -> List[Dict[str, str]]:
-        if self.selectors and self.selectors.item:
-            got = self._extract_by_selectors(soup, self.selectors, base)
-            if got:
-                return got
-        items = self._try_mihoyo_news(soup, base)
+    async def _page_items(self, page_url: str) -> List[PostRow]:
+        """Fetch and extract one listing page.
+
+        When earlier pages were served from embedded JSON, parse only the <script>
+        tags first; the full DOM is built only if that comes up empty.
+        """
+        if self._item_extractor != "_extract_from_embedded_json":
+            soup = await self.aget_soup(page_url)
+            return self._extract_items(soup, base=page_url)
+        resp = await self.afetch(page_url)
+        scripts = await asyncio.to_thread(self.make_soup, resp.text, _SCRIPTS_ONLY)
+        items = self._extract_from_embedded_json(scripts, page_url)
         if items:
             return items
-        json_items = self._extract_from_embedded_json(soup, base)
-        if json_items:
-            return json_items
-        out: List[Dict[str, str]] = []
-        for a in soup.select('article a[href]'):
+        soup = await asyncio.to_thread(self.make_soup, resp.text)
+        return self._extract_items(soup, base=page_url)
+
+    def _extract_items(self, soup: BeautifulSoup, *, base: str) -> List[PostRow]:
+        # Once a page has shown which extractor fits this site, try that one first
+        winner = self._item_extractor
+        if winner:
+            got = getattr(self, winner)(soup, base)
+            if got:
+                return got
+        for name in self._ITEM_EXTRACTORS:
+            if name == winner:
+                continue
+            got = getattr(self, name)(soup, base)
+            if got:
+                self._item_extractor = name
+                return got
+        return []
+
+    def _extract_by_task_selectors(self, soup: BeautifulSoup, base: str) -> List[PostRow]:
+        if self.selectors and self.selectors.item:
+            return self._extract_by_selectors(soup, self.selectors, base)
+        return []
+
+    def _extract_article_anchors(self, soup: BeautifulSoup, base: str) -> List[PostRow]:
+        out: List[PostRow] = []
+        verbose = self.log.isEnabledFor(logging.INFO)
+        for a in _ARTICLE_ANCHORS.select(soup):
             title = a.get_text(strip=True)
             href = a.get('href')
             if not title or not href:
                 continue
-            out.append({
-                'post_time': '',
-                'post_name': title,
-                'post_url': urljoin(base, href),
-            })
-            self.log.info(f"scanned:  | {title}")
+            out.append(PostRow('', title, _abs_url(base, href)))
+            if verbose:
+                self.log.info(f"scanned:  | {title}")
         return out
 
-    def _extract_by_selectors(self, soup: BeautifulSoup, sel: SelectorCfg, base: str) -> List[Dict[str, str]]:
-        rows: List[Dict[str, str]] = []
-        for node in soup.select(sel.item):
-            title_el = node.select_one(sel.title) if sel.title else None
-            href_el = node.select_one(sel.href) if sel.href else None
-            time_el = node.select_one(sel.time) if sel.time else None
+    def _extract_by_selectors(self, soup: BeautifulSoup, sel: SelectorCfg, base: str) -> List[PostRow]:
+        rows: List[PostRow] = []
+        # task.json selectors go through the same compile cache as the built-ins
+        title_css = _css(sel.title) if sel.title else None
+        href_css = _css(sel.href) if sel.href else None
+        time_css = _css(sel.time) if sel.time else None
+        verbose = self.log.isEnabledFor(logging.INFO)
+        for node in _css(sel.item).select(soup):
+            title_el = title_css.select_one(node) if title_css else None
+            href_el = href_css.select_one(node) if href_css else None
+            time_el = time_css.select_one(node) if time_css else None
             title = (title_el.get_text(strip=True) if title_el else '').strip()
             href = href_el.get('href') if href_el else None
             if not href:
                 continue
-            url = urljoin(base, href)
+            url = _abs_url(base, href)
             when = time_el.get_text(strip=True) if time_el else ''
-            rows.append({'post_time': when, 'post_name': title, 'post_url': url})
-            self.log.info(f"scanned: {when} | {title}")
+            rows.append(PostRow(when, title, url))
+            if verbose:
+                self.log.info(f"scanned: {when} | {title}")
         return rows
 
-    def _try_mihoyo_news(self, soup: BeautifulSoup, base: str) -> List[Dict[str, str]]:
-        candidates: List[Dict[str, str]] = []
-        for li in soup.select('li a[href], .article-list a[href], .news-list a[href], .news__list a[href]'):
+    def _try_mihoyo_news(self, soup: BeautifulSoup, base: str) -> List[PostRow]:
+        candidates: List[PostRow] = []
+        for li in _NEWS_ANCHORS.select(soup):
             title = li.get_text(strip=True)
             href = li.get('href')
             if not href or not title:
@@ -191,122 +448,161 @@ class PostScraper(BaseScraper):
             when = ''
             parent = li.parent
             if parent:
-                t = parent.select_one('.time, .date, time')
+                t = _NEWS_TIME.select_one(parent)
                 if t:
                     when = t.get_text(strip=True)
-            candidates.append({'post_time': when, 'post_name': title, 'post_url': urljoin(base, href)})
+            candidates.append(PostRow(when, title, _abs_url(base, href)))
         seen = set()
-        unique: List[Dict[str, str]] = []
+        unique: List[PostRow] = []
         for row in candidates:
-            u = row['post_url']
+            u = row.post_url
             if u in seen:
                 continue
             seen.add(u)
             unique.append(row)
         return unique
 
-    def _extract_from_embedded_json(self, soup: BeautifulSoup, base: str) -> List[Dict[str, str]]:
+    def _extract_from_embedded_json(self, soup: BeautifulSoup, base: str) -> List[PostRow]:
+        roots: List[Any] = []
+        # (island, script text to block-scan if the stream yields nothing)
+        streams: List[Tuple[str, str | None]] = []
         texts: List[str] = []
+
+        def load(island: str, source: str | None = None) -> bool:
+            if ijson is not None and len(island) >= _STREAM_MIN and _stream_ok(island):
+                streams.append((island, source))
+                return True
+            try:
+                roots.append(_json_loads(island))
+                return True
+            except Exception:
+                return False
+
         for s in soup.find_all('script'):
             if s.string:
-                texts.append(s.string)
+                t = str(s.string)
             elif s.contents:
                 try:
-                    texts.append(''.join(map(str, s.contents)))
+                    t = ''.join(map(str, s.contents))
                 except Exception:
-                    pass
-        blob_candidates: List[str] = []
-        for t in texts:
-            if '__NEXT_DATA__' in t or 'window.__NUXT__' in t or 'pageProps' in t or 'asyncData' in t:
-                blob_candidates.append(t)
-        if not blob_candidates:
-            blob_candidates = texts
-        rows: List[Dict[str, str]] = []
+                    continue
+            else:
+                continue
+            # known payloads: parse once, no scanning
+            if s.get('id') == '__NEXT_DATA__' and load(t, t):
+                continue
+            if '__NUXT__' in t:
+                literal = _assigned_literal(t, '__NUXT__')
+                if literal is not None and load(literal, t):
+                    continue
+            texts.append(t)
+        rows: List[PostRow] = []
 
         def push(title: str, href: str, when: str = '') -> None:
             if not title or not href:
                 return
-            rows.append({
-                'post_time': when or '',
-                'post_name': title.strip(),
-                'post_url': urljoin(base, href.strip()),
-            })
-
-        json_like = re.findall(r"[{\[][^<>]+[}\]]", '\n'.join(blob_candidates))
-        for block in json_like:
-            if len(block) > 2_000_000:
-                continue
-            try:
-                data = json.loads(block)
-            except Exception:
-                continue
-            stack = [data]
-            while stack:
-                cur = stack.pop()
-                if isinstance(cur, dict):
-                    keys = set(cur.keys())
-                    title_key = 'title' if 'title' in keys else ('name' if 'name' in keys else None)
-                    href_key = 'href' if 'href' in keys else ('url' if 'url' in keys else None)
-                    when_key = None
-                    for k in ('time', 'date', 'created_at', 'publish_time', 'pub_time'):
-                        if k in keys:
-                            when_key = k
-                            break
-                    if title_key and href_key:
-                        push(str(cur.get(title_key, '')), str(cur.get(href_key, '')), str(cur.get(when_key, '') or ''))
-                    for v in cur.values():
-                        if isinstance(v, (dict, list)):
-                            stack.append(v)
-                elif isinstance(cur, list):
-                    for v in cur:
-                        if isinstance(v, (dict, list)):
-                            stack.append(v)
+            rows.append(PostRow(when or '', title.strip(), _abs_url(base, href.strip())))
+
+        def drain() -> None:
+            """Collect items from the loaded roots/streams (consuming both lists)."""
+            for data in roots:
+                stack = deque((data,))
+                while stack:
+                    cur = stack.pop()
+                    if isinstance(cur, dict):
+                        title = cur.get('title') or cur.get('name')
+                        href = cur.get('href') or cur.get('url')
+                        if title and href:
+                            when = next((cur[k] for k in _WHEN_KEYS if k in cur), '')
+                            push(str(title), str(href), str(when or ''))
+                        for v in cur.values():
+                            if isinstance(v, (dict, list)):
+                                stack.append(v)
+                    elif isinstance(cur, list):
+                        for v in cur:
+                            if isinstance(v, (dict, list)):
+                                stack.append(v)
+            roots.clear()
+            for island, source in streams:
+                before = len(rows)
+                try:
+                    for title, href, when in _stream_items(island):
+                        push(str(title), str(href), str(when or ''))
+                except Exception as e:
+                    # a truncated/invalid island still yields the items before the error
+                    self.log.info(f"embedded JSON stream stopped: {e}")
+                if len(rows) == before and source is not None:
+                    texts.append(source)  # nothing usable: let the block scan try it
+            streams.clear()
+
+        drain()
+        if not rows:
+            blob_candidates = [t for t in texts if '__NEXT_DATA__' in t or 'window.__NUXT__' in t or 'pageProps' in t or 'asyncData' in t]
+            for t in blob_candidates or texts:
+                for block in _json_blocks(t):
+                    if ijson is None and len(block) > _BLOCK_MAX:
+                        continue
+                    load(block)
+            drain()
         seen = set()
-        uniq: List[Dict[str, str]] = []
+        uniq: List[PostRow] = []
         for r in rows:
-            u = r['post_url']
+            u = r.post_url
             if u in seen:
                 continue
             seen.add(u)
             uniq.append(r)
         return uniq
 
-    def _apply_keyword_filter(self, rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    def _apply_keyword_filter(self, rows: List[PostRow]) -> List[PostRow]:
         kw = (self.keyword or '').strip()
         if not kw:
             return rows
         kw_lower = kw.lower()
-        out: List[Dict[str, str]] = []
+        out: List[PostRow] = []
         for r in rows:
-            name = (r.get('post_name') or '').lower()
+            name = r.post_name.lower()
             if kw_lower in name:
                 out.append(r)
         return out
 
     # --- MiYoUShe detection and API extractor ---
 
-    def _render_html(self, url: str, *, sleep: float = 1.0, scrolldown: int = 0) -> BeautifulSoup | None:
+    async def _arender_html(self, url: str, *, sleep: float = 1.0, scrolldown: int = 0) -> BeautifulSoup | None:
         """Render a JS-heavy page using requests_html/pyppeteer if available.
         Returns BeautifulSoup or None if rendering failed or library missing.
+        Must run on the event loop thread (pyppeteer installs signal handlers there).
         """
-        session_cls = HTMLSession
-        if session_cls is None:
+        session_cls = AsyncHTMLSession
+        if self._html_session is None and session_cls is None:
             try:
-                from requests_html import HTMLSession as session_cls  # type: ignore
+                from requests_html import AsyncHTMLSession as session_cls  # type: ignore
                 self.log.info("requests_html loaded via lazy import")
             except Exception as e:
                 self.log.info(f"requests_html is not available: {e}")
                 return None
         try:
-            sess = session_cls()
-            r = sess.get(url, headers=self.session.headers)
+            if self._html_session is None:
+                self._html_session = session_cls()
+            sess = self._html_session
+            r = await sess.get(url, headers=self.session.headers)
             # render with a small wait; optionally scroll down a few times
-            r.html.render(sleep=sleep, scrolldown=scrolldown, timeout=30)
+            await r.html.arender(sleep=sleep, scrolldown=scrolldown, timeout=30)
             html = r.html.html
-            return BeautifulSoup(html, "html.parser")
+            return self.make_soup(html)
         except Exception as e:
             self.log.info(f"JS render failed: {e}")
             return None
+
+    async def aclose(self) -> None:
+        """Shut down the render session and its browser, if one was started."""
+        sess, self._html_session = self._html_session, None
+        if sess is not None:
+            try:
+                await sess.close()
+            except Exception as e:
+                self.log.info(f"closing render session failed: {e}")
+
     def _is_miyoushe(self, url: str) -> bool:
         try:
             host = urlparse(url).netloc
@@ -321,11 +617,13 @@ class PostScraper(BaseScraper):
         except Exception:
             return False
 
-    def _extract_mihoyo_official_news(self, start_url: str, existing_urls: Set[str]) -> List[Dict[str, str]]:
+    async def _extract_mihoyo_official_news(self, start_url: str, existing_urls: Set[str]) -> List[PostRow]:
         seen_page_urls: Set[str] = set()
         page_url = start_url
         page = 0
-        out: List[Dict[str, str]] = []
+        out: List[PostRow] = []
+        # one running set: already in the CSV or already taken from an earlier page/anchor
+        seen: Set[str] = set(existing_urls)
         while page_url:
             if page_url in seen_page_urls:
                 self.log.info("pagination loop detected; stopping")
@@ -333,22 +631,22 @@ class PostScraper(BaseScraper):
             seen_page_urls.add(page_url)
             page += 1
             self.log.info(f"fetching news page {page}: {page_url}")
-            soup = self.get_soup(page_url)
+            soup = await self.aget_soup(page_url)
 
             # Extract items on this page
-            rows: List[Dict[str, str]] = []
             anchors = []
+            js_soup = None
 
             def collect_anchors(soup_obj: BeautifulSoup):
-                cards = soup_obj.select('.news-list li, .news__list li, .article-list li, li.news-item, article, .news-list__item')
+                cards = _NEWS_CARDS.select(soup_obj)
                 tmp = []
                 if cards:
                     for node in cards:
-                        a = node if getattr(node, 'name', '') == 'a' else node.select_one('a[href]')
+                        a = node if getattr(node, 'name', '') == 'a' else _HREF_ANCHOR.select_one(node)
                         if a:
                             tmp.append((node, a))
                 else:
-                    for a in soup_obj.select('a[href^="/news/"]'):
+                    for a in _NEWS_PATH_ANCHORS.select(soup_obj):
                         tmp.append((a.parent, a))
                 return tmp
 
@@ -356,7 +654,7 @@ class PostScraper(BaseScraper):
 
             # If nothing found, try JS rendering
             if not anchors:
-                js_soup = self._render_html(page_url, sleep=1.2, scrolldown=2)
+                js_soup = await self._arender_html(page_url, sleep=1.2, scrolldown=2)
                 if js_soup is not None:
                     anchors = collect_anchors(js_soup)
 
@@ -366,53 +664,44 @@ class PostScraper(BaseScraper):
             # Fallback: try extracting from embedded JSON blobs
             if not anchors:
                 json_rows = self._extract_from_embedded_json(soup, page_url)
-                if not json_rows and 'js_soup' in locals() and js_soup is not None:
+                if not json_rows and js_soup is not None:
                     json_rows = self._extract_from_embedded_json(js_soup, page_url)
-                if json_rows:
-                    # Filter to only /news/<id>
-                    filtered = []
-                    for jr in json_rows:
-                        u = jr.get('post_url') or ''
-                        if re.search(r"/news/\d+", u):
-                            filtered.append(jr)
-                    if filtered:
-                        self.log.info(f"extracted {len(filtered)} items from embedded JSON")
-                        out.extend([r for r in filtered if r['post_url'] not in existing_urls])
-                        # attempt to discover a next page from JSON is site-specific; keep normal pager flow
+                # Filter to only /news/<id>
+                filtered = [jr for jr in json_rows if _NEWS_ID_RE.search(jr.post_url)]
+                if filtered:
+                    self.log.info(f"extracted {len(filtered)} items from embedded JSON")
+                    for jr in filtered:
+                        if jr.post_url not in seen:
+                            seen.add(jr.post_url)
+                            out.append(jr)
+                    # attempt to discover a next page from JSON is site-specific; keep normal pager flow
 
             page_new = 0
-            anchor_seen: Set[str] = set()
+            verbose = self.log.isEnabledFor(logging.INFO)
             for node, a in anchors:
                 href = a.get('href')
                 title = a.get_text(strip=True)
                 if not href:
                     continue
                 # Only keep article detail links like /news/<id>
-                if not re.search(r"/news/\d+", href):
+                if not _NEWS_ID_RE.search(href):
                     continue
-                url = urljoin(page_url, href)
-                if url in anchor_seen:
+                url = _abs_url(page_url, href)
+                if url in seen:
                     continue
-                anchor_seen.add(url)
+                seen.add(url)
 
                 when = ''
                 # try nearby date elements
                 parent = node if getattr(node, 'name', '') != 'a' else node.parent
                 if parent:
-                    t = parent.select_one('time, .time, .date, .news__date, .news-item__date, .list-date, .date__text')
+                    t = _NEWS_DATE.select_one(parent)
                     if t:
                         when = t.get_text(strip=True)
-                rows.append({'post_time': when, 'post_name': title, 'post_url': url})
-                self.log.info(f"scanned: {when} | {title}")
-
-            # filter out ones already present
-            new_rows = []
-            for r in rows:
-                if r['post_url'] in existing_urls:
-                    continue
-                new_rows.append(r)
+                out.append(PostRow(when, title, url))
+                if verbose:
+                    self.log.info(f"scanned: {when} | {title}")
                 page_new += 1
-            out.extend(new_rows)
 
             # stop conditions
             if self.max_pages > 0 and page >= self.max_pages:
@@ -423,29 +712,44 @@ class PostScraper(BaseScraper):
 
             # find the next page link
             next_url = self._find_next_page_url(soup, base=page_url)
-            if not next_url and 'js_soup' in locals() and js_soup is not None:
+            if not next_url and js_soup is not None:
                 next_url = self._find_next_page_url(js_soup, base=page_url)
             self.log.info(f"next page -> {next_url}")
             if not next_url:
                 break
             page_url = next_url
-        # dedupe by url
-        uniq_map: Dict[str, Dict[str, str]] = {}
-        for r in out:
-            uniq_map.setdefault(r['post_url'], r)
-        return list(uniq_map.values())
+        return out
 
     def _find_next_page_url(self, soup: BeautifulSoup, *, base: str) -> str:
+        # The pager strategy that worked on an earlier page goes first; the rest
+        # are still tried in their usual order when it misses.
+        winner = self._pager_strategy
+        if winner:
+            url = getattr(self, winner)(soup, base)
+            if url:
+                return url
+        for name in self._PAGER_STRATEGIES:
+            if name == winner:
+                continue
+            url = getattr(self, name)(soup, base)
+            if url:
+                self._pager_strategy = name
+                return url
+        return self._next_by_query(base)
+
+    def _next_by_rel(self, soup: BeautifulSoup, base: str) -> str:
         # 1) rel=next or obvious next classes
-        for a in soup.select('a[rel="next"], a.next, .next a, .pager a.next, .pagination a.next'):
+        for a in _NEXT_LINKS.select(soup):
             href = a.get('href')
             if href:
-                return urljoin(base, href)
+                return _abs_url(base, href)
+        return ''
 
+    def _next_by_number(self, soup: BeautifulSoup, base: str) -> str:
         # 2) numbered pagination: pick the link whose text is current+1
         cur = None
         # find current page number from active element or URL
-        cur_el = soup.select_one('.pagination .active, .pager .active, .page-item.active, .active > a')
+        cur_el = _ACTIVE_PAGE.select_one(soup)
         if cur_el:
             try:
                 cur = int(cur_el.get_text(strip=True))
@@ -454,7 +758,6 @@ class PostScraper(BaseScraper):
         if cur is None:
             # parse from URL query (?page=NN)
             try:
-                from urllib.parse import urlparse, parse_qs
                 q = parse_qs(urlparse(base).query)
                 if 'page' in q:
                     cur = int(q['page'][0])
@@ -462,24 +765,28 @@ class PostScraper(BaseScraper):
                 cur = None
         if cur is not None:
             want = str(cur + 1)
-            for a in soup.select('.pagination a, .pager a, a.page-link, a'):
+            for a in _PAGE_LINKS.select(soup):
                 txt = (a.get_text() or '').strip()
                 if txt == want:
                     href = a.get('href')
                     if href:
-                        return urljoin(base, href)
+                        return _abs_url(base, href)
+        return ''
 
+    def _next_by_text(self, soup: BeautifulSoup, base: str) -> str:
         # 3) last resort: any anchor with text hint
         for a in soup.find_all('a'):
             txt = (a.get_text() or '').strip()
             if txt in {'>', '›', '下一页', '下一頁', '下一页 ›'}:
                 href = a.get('href')
                 if href:
-                    return urljoin(base, href)
+                    return _abs_url(base, href)
+        return ''
 
-        # 4) ultimate fallback: try incrementing ?page=
+    @staticmethod
+    def _next_by_query(base: str) -> str:
+        # 4) ultimate fallback: try incrementing ?page= (never cached as the winner)
         try:
-            from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
             u = urlparse(base)
             q = parse_qs(u.query)
             cur = int(q.get('page', ['1'])[0])
@@ -489,7 +796,7 @@ class PostScraper(BaseScraper):
         except Exception:
             return ''
 
-    def _extract_miyoushe_forum(self, base_url: str, existing_urls: Set[str]) -> List[Dict[str, str]]:
+    async def _extract_miyoushe_forum(self, base_url: str, existing_urls: Set[str]) -> List[PostRow]:
         parsed = urlparse(base_url)
         qs = parse_qs(parsed.query)
         sort_type = int(qs.get('type', [3])[0])  # default to 3
@@ -518,7 +825,7 @@ class PostScraper(BaseScraper):
         prev_last_id = None
         seen_post_ids: Set[str] = set()
         page = 0
-        all_rows: List[Dict[str, str]] = []
+        all_rows: List[PostRow] = []
 
         while True:
             page += 1
@@ -532,9 +839,9 @@ class PostScraper(BaseScraper):
             if gids is not None:
                 params['gids'] = gids
 
-            resp = self.fetch(api_url, params=params)
+            resp = await self.afetch(api_url, params=params)
             try:
-                data = resp.json()
+                data = _json_loads(resp.content)
             except Exception:
                 break
             payload = (data or {}).get('data') or {}
@@ -545,6 +852,7 @@ class PostScraper(BaseScraper):
             self.log.info(f"page {page}: got {len(lst)} items, last_id={payload.get('last_id')}")
 
             page_new = 0
+            verbose = self.log.isEnabledFor(logging.INFO)
             for item in lst:
                 post = item.get('post') or {}
                 post_id = str(post.get('post_id') or '')
@@ -557,8 +865,8 @@ class PostScraper(BaseScraper):
                 when = ''
                 try:
                     ts = int(created)
-                    if 946684800 < ts < 4102444800:
-                        when = datetime.utcfromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+                    if _TS_MIN < ts < _TS_MAX:
+                        when = _utc_stamp(ts)
                 except Exception:
                     when = created
 
@@ -566,8 +874,9 @@ class PostScraper(BaseScraper):
                 if title and url:
                     if url in existing_urls:
                         continue
-                    all_rows.append({'post_time': when, 'post_name': title, 'post_url': url})
-                    self.log.info(f"scanned: {when} | {title}")
+                    all_rows.append(PostRow(when, title, url))
+                    if verbose:
+                        self.log.info(f"scanned: {when} | {title}")
                     page_new += 1
 
             # Choose next page cursor
@@ -594,9 +903,9 @@ class PostScraper(BaseScraper):
 
         # de-dupe by URL
         seen = set()
-        out: List[Dict[str, str]] = []
+        out: List[PostRow] = []
         for r in all_rows:
-            u = r['post_url']
+            u = r.post_url
             if u in seen:
                 continue
             seen.add(u)
@@ -609,121 +918,191 @@ class PostScraper(BaseScraper):
         seen: Set[str] = set()
         if not out_path.exists():
             return seen
+        # Sidecar URL list, trusted only while it matches the CSV's size/mtime
         try:
-            with open(out_path, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    url = (row.get("post_url") or "").strip()
-                    if url:
-                        seen.add(url)
+            with open(out_path.with_suffix(".urls"), "r", encoding="utf-8") as f:
+                stamp, _, body = f.read().partition("\n")
+            if stamp == self._csv_stamp(out_path):
+                seen.update(body.splitlines())
+                seen.discard("")
+                return seen
+        except OSError:
+            pass
+        try:
+            with open(out_path, "r", newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                i = {name: n for n, name in enumerate(next(reader, []))}.get("post_url")
+                if i is not None:
+                    seen.update(row[i].strip() for row in reader if len(row) > i)
+                    seen.discard("")
         except Exception:
             pass
+        self._write_urls_sidecar(out_path, seen)
         return seen
 
+    @staticmethod
+    def _csv_stamp(path: Path) -> str:
+        st = path.stat()
+        return f"# {st.st_size} {st.st_mtime_ns}"
+
+    def _write_urls_sidecar(self, out_path: Path, urls: Iterable[str]) -> None:
+        """posts/<task>.urls: stamp line + one URL per line, so re-runs skip the CSV scan."""
+        sidecar = out_path.with_suffix(".urls")
+        tmp = sidecar.with_name(sidecar.name + ".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+                f.write(self._csv_stamp(out_path))
+                f.write("\n")
+                f.write("\n".join(urls))
+            os.replace(tmp, sidecar)
+        except OSError as e:
+            self.log.info(f"could not write {sidecar}: {e}")
+
     # -------------------- writing --------------------
-    def _write_posts_csv(self, rows: List[Dict[str, str]], existing_urls: Set[str] | None = None) -> None:
+    def _write_posts_csv(self, rows: List[PostRow], existing_urls: Set[str] | None = None) -> None:
         posts_root = Path("posts")
         posts_root.mkdir(parents=True, exist_ok=True)
         out_path = posts_root / f"{self.task_name}.csv"
-        fieldnames = ["post_time", "post_name", "post_url"]
+        fieldnames = list(PostRow._fields)
 
-        # Load existing rows for merge
-        existing: List[Dict[str, str]] = []
-        if out_path.exists():
-            try:
-                with open(out_path, "r", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    for r in reader:
-                        existing.append({k: r.get(k, "") for k in fieldnames})
-            except Exception:
-                pass
-
-        # Merge, dedupe by post_url (prefer existing row if duplicate)
-        by_url: Dict[str, Dict[str, str]] = {}
-        for r in existing:
-            u = (r.get("post_url") or "").strip()
-            if u:
-                by_url[u] = r
-        new_rows: List[Dict[str, str]] = []
+        if existing_urls is None:
+            existing_urls = self._load_existing_urls()
+
+        # New rows only (dedupe by post_url; an existing row wins over a scraped one)
+        new_rows: List[PostRow] = []
+        new_urls: Set[str] = set()
         for r in rows:
-            u = (r.get("post_url") or "").strip()
-            if not u:
+            u = r.post_url.strip()
+            if not u or u in existing_urls or u in new_urls:
                 continue
-            if u not in by_url:
-                by_url[u] = {k: r.get(k, "") for k in fieldnames}
-                new_rows.append({k: r.get(k, "") for k in fieldnames})
-
-        # Place new rows on top, then the rest (excluding duplicates)
-        merged = new_rows + [r for r in existing if (r.get("post_url") or "").strip() not in {row["post_url"] for row in new_rows}]
-
-        with open(out_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for r in merged:
-                writer.writerow({k: r.get(k, "") for k in fieldnames})
-        self.log.info(f"wrote CSV: {out_path} (added {len(new_rows)} new, total {len(merged)})")
-    def _extract_mihoyo_official_news_api(self, existing_urls: Set[str]) -> List[Dict[str, str]]:
+            new_urls.add(u)
+            new_rows.append(r)
+
+        # Stream: new rows on top, then the old file row by row into a temp file
+        tmp = out_path.with_name(out_path.name + ".tmp")
+        total = len(new_rows)
+        all_urls = set(new_urls)
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(new_rows)
+            if out_path.exists():
+                try:
+                    with open(out_path, "r", newline="", encoding="utf-8") as src:
+                        reader = csv.reader(src)
+                        pos = {name: i for i, name in enumerate(next(reader, []))}
+                        idx = [pos.get(k) for k in fieldnames]
+                        for row in reader:
+                            if not row:
+                                continue
+                            out = [row[i] if i is not None and i < len(row) else "" for i in idx]
+                            u = out[2].strip()
+                            if u in new_urls:
+                                continue
+                            writer.writerow(out)
+                            if u:
+                                all_urls.add(u)
+                            total += 1
+                except Exception:
+                    pass
+        os.replace(tmp, out_path)
+        self._write_urls_sidecar(out_path, all_urls)
+        self.log.info(f"wrote CSV: {out_path} (added {len(new_rows)} new, total {total})")
+
+    async def _extract_mihoyo_official_news_api(self, existing_urls: Set[str]) -> List[PostRow]:
         """Use the official JSON endpoint observed in DevTools to page news quickly.
         Defaults are tuned for zzz.mihoyo.com based on provided network capture.
+
+        The API is offset-paged (iPage), so with a known max_pages the next pages are
+        fetched ahead (``concurrency`` at a time) and processed in order; whatever is
+        still in flight when a stop rule hits is cancelled.
         """
         api = self.mhy_api_url
         chan = self.mhy_channel_id
         lang = self.mhy_lang
         page = 1
         page_size = self.page_size if self.page_size > 0 else 9
-        out: List[Dict[str, str]] = []
+        out: List[PostRow] = []
         total_seen_new = 0
-        while True:
-            params = {
-                "iPageSize": page_size,
-                "iPage": page,
-                "sLangKey": lang,
-                "iChanId": chan,
-            }
-            # The API is same-site CORS in browser; for server we just send headers
-            headers = {
-                "Referer": "https://zzz.mihoyo.com/",
-                "Origin": "https://zzz.mihoyo.com",
-                "Accept": "application/json, text/plain, */*",
-                "X-Rpc-Language": lang,
-            }
-            self.log.info(f"API page {page}: {api} params={params}")
-            resp = self.fetch(api, params=params, headers=headers)
-            try:
-                data = resp.json()
-            except Exception as e:
-                self.log.info(f"API JSON parse failed on page {page}: {e}")
-                break
-            payload = (data or {}).get("data") or {}
-            items = payload.get("list") or []
-            if not items:
-                break
-            page_new = 0
-            for it in items:
-                # Fields seen in capture: iInfoId, sTitle, dtStartTime
-                post_id = str(it.get("iInfoId") or "").strip()
-                title = str(it.get("sTitle") or "").strip()
-                when = str(it.get("dtStartTime") or it.get("dtCreateTime") or "").strip()
-                if not post_id or not title:
-                    continue
-                url = f"https://zzz.mihoyo.com/news/{post_id}"
-                if url in existing_urls:
-                    continue
-                out.append({"post_time": when, "post_name": title, "post_url": url})
-                self.log.info(f"scanned(API): {when} | {title}")
-                total_seen_new += 1
-                page_new += 1
-            # Early stop rules
-            if self.max_pages > 0 and page >= self.max_pages:
-                break
-            if self.stop_on_seen and page_new == 0 and page > 1:
-                self.log.info("no new items on this API page; stopping due to stop_on_seen=True")
-                break
-            page += 1
+        # The API is same-site CORS in browser; for server we just send headers
+        headers = {
+            "Referer": "https://zzz.mihoyo.com/",
+            "Origin": "https://zzz.mihoyo.com",
+            "Accept": "application/json, text/plain, */*",
+            "X-Rpc-Language": lang,
+        }
+        window = 1
+        if self.max_pages > 0:
+            limit = int(self.task.get("concurrency") or self.config.get("concurrency") or 4)
+            window = max(1, min(limit, self.max_pages))
+        inflight: Dict[int, asyncio.Task] = {}
+        next_page = 1
+
+        def schedule() -> None:
+            nonlocal next_page
+            while len(inflight) < window and (self.max_pages <= 0 or next_page <= self.max_pages):
+                params = {
+                    "iPageSize": page_size,
+                    "iPage": next_page,
+                    "sLangKey": lang,
+                    "iChanId": chan,
+                }
+                self.log.info(f"API page {next_page}: {api} params={params}")
+                inflight[next_page] = asyncio.create_task(self.afetch(api, params=params, headers=headers))
+                next_page += 1
+
+        try:
+            while True:
+                schedule()
+                try:
+                    resp = await inflight.pop(page)
+                except Exception as e:
+                    # e.g. an HTTP error past the last page: stop like a bad payload
+                    self.log.info(f"API request failed on page {page}: {e}")
+                    break
+                try:
+                    data = _json_loads(resp.content)
+                except Exception as e:
+                    self.log.info(f"API JSON parse failed on page {page}: {e}")
+                    break
+                payload = (data or {}).get("data") or {}
+                items = payload.get("list") or []
+                if not items:
+                    break
+                page_new = 0
+                verbose = self.log.isEnabledFor(logging.INFO)
+                for it in items:
+                    # Fields seen in capture: iInfoId, sTitle, dtStartTime
+                    post_id = str(it.get("iInfoId") or "").strip()
+                    title = str(it.get("sTitle") or "").strip()
+                    when = str(it.get("dtStartTime") or it.get("dtCreateTime") or "").strip()
+                    if not post_id or not title:
+                        continue
+                    url = f"https://zzz.mihoyo.com/news/{post_id}"
+                    if url in existing_urls:
+                        continue
+                    out.append(PostRow(when, title, url))
+                    if verbose:
+                        self.log.info(f"scanned(API): {when} | {title}")
+                    total_seen_new += 1
+                    page_new += 1
+                # Early stop rules
+                if self.max_pages > 0 and page >= self.max_pages:
+                    break
+                if self.stop_on_seen and page_new == 0 and page > 1:
+                    self.log.info("no new items on this API page; stopping due to stop_on_seen=True")
+                    break
+                page += 1
+        finally:
+            # cancel the read-ahead and collect every outcome, so failed prefetches
+            # don't surface as "Task exception was never retrieved"
+            for task in inflight.values():
+                task.cancel()
+            await asyncio.gather(*inflight.values(), return_exceptions=True)
         # Deduplicate just in case
-        uniq: Dict[str, Dict[str, str]] = {}
+        uniq: Dict[str, PostRow] = {}
         for r in out:
-            uniq[r["post_url"]] = r
+            uniq[r.post_url] = r
         return list(uniq.values())
     
 if __name__ == "__main__":
@@ -1,40 +1,64 @@
 import sys
 from pathlib import Path
+import numpy as np
+import PIL
 from PIL import Image
 
+# Optional: PyTurboJPEG decodes JPEGs through libjpeg-turbo's TurboJPEG API
+try:
+	from turbojpeg import TurboJPEG, TJPF_RGB
+	_TJ = TurboJPEG()
+except Exception:
+	_TJ = None
+
+def _pillow_simd():
+	# Pillow-SIMD builds are versioned X.Y.Z.postN; same API, SIMD resample kernels
+	return ".post" in PIL.__version__
+
+def _dct_scale(w, h, size=(3840, 2160)):
+	# largest 1/N (N in 1,2,4,8) JPEG decode scale that still covers size
+	for n in (8, 4, 2):
+		if w // n >= size[0] and h // n >= size[1]:
+			return n
+	return 1
+
 def resize_and_pad(input_path):
 	input_path = Path(input_path)
-	img = Image.open(input_path)
-	# Step 1: resize to 3840x2160
-	img_resized = img.resize((3840, 2160), Image.LANCZOS)
-
-	# Crop 3840x(0-1930) (from y=0 to y=1930)
-	main_crop = img_resized.crop((0, 0, 3840, 1930))  # 3840x1930
-	# Append 3840x(1870-2160) (from y=1870 to y=2160)
-	append1 = img_resized.crop((0, 1870, 3840, 2160))        # 3840x290
-	# Append 3840x((2160-60)-2160) (from y=2160-60 to y=2160)
-	append2 = img_resized.crop((0, 2160-60, 3840, 2160))       # 3840x60
-	# Append 3840x((2160-240)-2160) (from y=2160-240 to y=2160)
-	# append3 = img_resized.crop((0, 2160-240, 3840, 2160))        # 3840x80
-
-	# Stack them: main_crop + append1 + append2 + append3
-	total_height = 2000 + 80 + 160 + 80  # 2320
-	new_img = Image.new("RGB", (3840, total_height))
-	y = 0
-	new_img.paste(main_crop, (0, y)); y += 1930
-	new_img.paste(append1, (0, y)); y += 290
-	new_img.paste(append2, (0, y)); y += 60
-	new_img.paste(append2, (0, y)); y += 60
-	new_img.paste(append2, (0, y)); y += 60
-    
-	# new_img.paste(append3, (0, y)); y += 80
+	if _TJ is not None and input_path.suffix.lower() in (".jpg", ".jpeg"):
+		buf = input_path.read_bytes()
+		w, h = _TJ.decode_header(buf)[:2]
+		img = Image.fromarray(_TJ.decode(buf, pixel_format=TJPF_RGB, scaling_factor=(1, _dct_scale(w, h))))
+	else:
+		img = Image.open(input_path)
+		if img.format == "JPEG":
+			# libjpeg scales by 1/2, 1/4 or 1/8 in the IDCT, keeping >= 3840x2160
+			img.draft("RGB", (3840, 2160))
+	# Step 1: resize to 3840x2160 (only the residual factor after a DCT downscale)
+	img_resized = img if img.size == (3840, 2160) else img.resize((3840, 2160), Image.LANCZOS)
+
+	# Assemble the 3840x2320 output from horizontal strips of one array view;
+	# np.concatenate copies each strip once (per-strip tweaks stay vectorized)
+	if img_resized.mode != "RGB":
+		img_resized = img_resized.convert("RGB")
+	arr = np.asarray(img_resized)
+	footer = arr[2100:2160]  # 3840x60 (y=2160-60..2160), one view reused for every repeat
+	strips = [
+		arr[0:1930],       # 3840x1930 main crop (y=0..1930)
+		arr[1870:2160],    # 3840x290 (y=1870..2160)
+		footer,
+		footer[:40],       # second repeat, clipped at the 2320 canvas edge
+	]
+	out = np.concatenate(strips, axis=0)  # 1930 + 290 + 60 + 40 = 2320 rows
+	new_img = Image.fromarray(out)
 
 	# Output path
 	out_path = input_path.parent / (input_path.stem + "_mac" + input_path.suffix)
-	new_img.save(out_path)
+	new_img.save(out_path, quality=95, subsampling=0)  # JPEG options; PNG ignores them
 	print(f"Saved: {out_path}")
 
 if __name__ == "__main__":
+    if not _pillow_simd():
+        print("Note: stock Pillow; installing pillow-simd instead speeds up the LANCZOS resize (drop-in, no code change)")
     file_path = "downloads/米游社-官方资讯-minas/2025.10.01 《绝区零》2025年10月月历壁纸/10月月历壁纸_PC版.jpg"
     resize_and_pad(file_path)
 
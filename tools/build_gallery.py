@@ -3,25 +3,66 @@
 Build a lightweight gallery for GitHub Pages:
  - Scans downloads/ for images (newest first)
  - Generates compressed previews (~100 KB max each) in docs/thumbs/
- - Writes docs/meta.json with preview/original info
+ - Writes docs/meta.json ({"order": [...], "entries": {...}}) with preview/original info,
+   reusing unchanged entries and skipping the write when nothing changed
  - Writes docs/index.html that fetches meta.json client-side and renders cards
 
 Env overrides:
-  GALLERY_DOWNLOADS   root folder to scan (default: downloads)
-  GALLERY_TITLE       page title (default: Downloads Gallery)
-  GALLERY_MAX_BYTES   max preview size in bytes (default: 100000)
+  GALLERY_DOWNLOADS       root folder to scan (default: downloads)
+  GALLERY_TITLE           page title (default: Downloads Gallery)
+  GALLERY_MAX_BYTES       max preview size in bytes (default: 100000)
+  GALLERY_PREVIEW_SIDE    longest preview side in px (default: 1600)
+  GALLERY_WORKERS         preview worker processes (default: CPU count)
+  GALLERY_PREVIEW_FORMAT  preview format: webp, avif or jpeg (default: webp)
+  GALLERY_RENDER_INDEX    1 = write docs/index.html from the built-in shell with the first
+                          page of cards pre-rendered (default: 0, index.html kept by hand)
 """
 from __future__ import annotations
 
+import hashlib
 import html
 import io
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 import re
 from datetime import datetime
+from functools import lru_cache
 from urllib.parse import quote
 
+# Optional: PyTurboJPEG (libjpeg-turbo TurboJPEG API) for JPEG decode/encode
+try:
+    import numpy as np
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+    _TJ = TurboJPEG()
+except Exception:
+    _TJ = None
+
+# Optional: orjson for faster JSON (de)serialization (stdlib json as fallback)
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except Exception:
+    orjson = None  # type: ignore
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+# Optional: xxHash3 for source-file signatures (falls back to hashlib.blake2b)
+try:
+    import xxhash
+except Exception:
+    xxhash = None
+
+# Optional: AVIF support for Pillow builds without it (Pillow >= 11.3 has it natively)
+try:
+    import pillow_avif  # noqa: F401  (registers the AVIF plugin)
+except Exception:
+    pass
+
 IMG_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"}
 DOWNLOAD_ROOT = Path(os.getenv("GALLERY_DOWNLOADS", "downloads"))
 DOCS_DIR = Path("docs")
@@ -30,6 +71,22 @@ CACHE_FILE = DOCS_DIR / "cached.json"
 TITLE = os.getenv("GALLERY_TITLE", "Downloads Gallery")
 THUMB_DIR = DOCS_DIR / "thumbs"
 MAX_BYTES = int(os.getenv("GALLERY_MAX_BYTES", "100000"))
+PREVIEW_SIDE = int(os.getenv("GALLERY_PREVIEW_SIDE", "1600"))
+WORKERS = int(os.getenv("GALLERY_WORKERS", "0")) or (os.cpu_count() or 1)
+SCAN_THREADS = 16  # directory listing/stat/hashing is I/O-bound
+RENDER_INDEX = os.getenv("GALLERY_RENDER_INDEX", "0") == "1"
+PAGE_SIZE = 60  # cards per page; the shell's JS uses the same number
+PREVIEW_FORMAT = os.getenv("GALLERY_PREVIEW_FORMAT", "webp").strip().lower()
+if PREVIEW_FORMAT == "jpg":
+    PREVIEW_FORMAT = "jpeg"
+# suffix, Pillow save options, extra options for the kept encode only
+_FORMATS = {
+    "jpeg": (".jpg", {"format": "JPEG"}, {"optimize": True}),
+    "webp": (".webp", {"format": "WEBP", "method": 4}, {}),
+    "avif": (".avif", {"format": "AVIF", "speed": 6}, {}),
+}
+PREVIEW_SUFFIX, _SAVE_OPTS, _FINAL_OPTS = _FORMATS.get(PREVIEW_FORMAT, _FORMATS["webp"])
+_TJ_ENCODE = _TJ is not None and _SAVE_OPTS["format"] == "JPEG"
 
 
 def _date_from_folder(folder: str, mtime: float) -> float:
@@ -47,173 +104,444 @@ def _date_from_folder(folder: str, mtime: float) -> float:
         return mtime
 
 
+def _scan(d: str) -> tuple[list[tuple[str, os.stat_result]], list[str]]:
+    """List one directory: (image file names with their stat, subdirectory paths)."""
+    files, subdirs = [], []
+    try:
+        with os.scandir(d) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    subdirs.append(e.path)
+                elif e.is_file() and os.path.splitext(e.name)[1].lower() in IMG_EXTS:
+                    files.append((e.name, e.stat()))
+    except OSError as e:
+        print(f"[gallery] cannot scan {d}: {e}")
+    return files, subdirs
+
+
+def _scan_tree(root: Path) -> list[tuple[str, list[tuple[str, os.stat_result]]]]:
+    """Walk root level by level, listing each level's directories in parallel.
+
+    Returns (directory, image files) pairs so per-folder work is done once.
+    """
+    found: list[tuple[str, list[tuple[str, os.stat_result]]]] = []
+    level = [str(root)]
+    with ThreadPoolExecutor(max_workers=SCAN_THREADS) as ex:
+        while level:
+            nxt: list[str] = []
+            for d, (files, subdirs) in zip(level, ex.map(_scan, level)):
+                if files:
+                    found.append((d, files))
+                nxt.extend(subdirs)
+            level = nxt
+    return found
+
+
+def _cache_usable(entry: dict) -> bool:
+    """Cached preview is in the current format (or is a verbatim copy of a small source)."""
+    return entry["thumb"].endswith(PREVIEW_SUFFIX) or bool(entry.get("copied"))
+
+
+def _file_hash(path: str) -> str:
+    """Content signature of a source image (xxh3-128, streamed in 1 MiB chunks)."""
+    h = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    return h.hexdigest()
+
+
 def find_images() -> list[dict[str, str]]:
     items: list[dict[str, str]] = []
     if not DOWNLOAD_ROOT.exists():
         return items
     cache = load_cache()
-    for path in DOWNLOAD_ROOT.rglob("*"):
-        if not path.is_file():
-            continue
-        if path.suffix.lower() not in IMG_EXTS:
-            continue
-        rel_from_root = path.relative_to(Path("."))
-        web_path = "../" + quote(str(rel_from_root).replace("\\", "/"), safe="/")
-        folder = str(path.parent.relative_to(DOWNLOAD_ROOT)).replace("\\", "/")
-        stat = path.stat()
-        cache_key = str(path)
-        cached = cache.get(cache_key)
-        folder_name = folder if folder else ""
-        items.append(
-            {
-                "src": web_path,  # original path (likely LFS; may 404 on Pages)
-                "fs_path": str(path),
-                "folder": folder if folder != "." else "",
-                "name": path.stem,
-                "mtime": stat.st_mtime,
-                "date_sort": _date_from_folder(folder_name, stat.st_mtime),
-                "cached_thumb": cached["thumb"] if cached and cached.get("mtime") == stat.st_mtime else None,
-                "cache_key": cache_key,
-            }
-        )
-    # newest first by folder date (if present), then mtime
+    for d, files in _scan_tree(DOWNLOAD_ROOT):
+        # folder-level strings once per directory, plain str joins per file
+        folder = os.path.relpath(d, DOWNLOAD_ROOT).replace("\\", "/")
+        if folder == ".":
+            folder = ""
+        web_dir = "../" + quote(d.replace("\\", "/"), safe="/") + "/"
+        for name, stat in files:
+            fs_path = os.path.join(d, name)
+            cached = cache.get(fs_path)
+            fresh = (
+                cached
+                if cached and cached.get("mtime") == stat.st_mtime and _cache_usable(cached)
+                else None
+            )
+            items.append(
+                {
+                    "src": web_dir + quote(name),  # original path (likely LFS; may 404 on Pages)
+                    "fs_path": fs_path,
+                    "folder": folder,
+                    "name": os.path.splitext(name)[0],
+                    "mtime": stat.st_mtime,
+                    "date_sort": _date_from_folder(folder, stat.st_mtime),
+                    "cached_thumb": fresh["thumb"] if fresh else None,
+                    "cached_size": fresh.get("size") if fresh else None,
+                    "hash": fresh.get("hash") if fresh else None,
+                    "copied": bool(fresh and fresh.get("copied")),
+                    "cache_key": fs_path,
+                }
+            )
+    # mtime changed (e.g. fresh CI checkout): match on content instead; this also
+    # reuses a preview for the same image filed under another folder
+    stale = [it for it in items if not it["cached_thumb"]]
+    if stale:
+        by_hash = {
+            v["hash"]: v
+            for v in cache.values()
+            if v.get("hash") and _cache_usable(v)
+        }
+        with ThreadPoolExecutor(max_workers=SCAN_THREADS) as ex:
+            hashes = list(ex.map(_file_hash, [it["fs_path"] for it in stale]))
+        for it, h in zip(stale, hashes):
+            it["hash"] = h
+            hit = by_hash.get(h)
+            if hit and (DOCS_DIR / hit["thumb"]).exists():
+                it["cached_thumb"] = hit["thumb"]
+                it["cached_size"] = hit.get("size")
+                it["copied"] = bool(hit.get("copied"))
+    # newest first by folder date (if present), then mtime; path order breaks ties
+    # so the listing (and meta.json) doesn't depend on directory entry order
+    items.sort(key=lambda x: x["cache_key"])
     return sorted(items, key=lambda x: x["date_sort"], reverse=True)
 
 
-def build_previews(items: list[dict[str, str]]) -> None:
+def _fit(w: int, h: int) -> tuple[int, int]:
+    """Size of a w x h image once its longest side fits PREVIEW_SIDE."""
+    f = min(1.0, PREVIEW_SIDE / max(w, h))
+    return max(1, int(w * f)), max(1, int(h * f))
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write data to path via a .tmp sibling + os.replace (raw fd, no io buffering).
+
+    Readers (e.g. a Pages fetch mid-deploy) see either the old or the new file.
+    """
+    tmp = f"{path}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
     try:
-        from PIL import Image
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
+def _decode_rgb(path: Path, Image):
+    """Open as an RGB PIL image, letting JPEGs decode at a reduced DCT scale.
+
+    libjpeg can scale by 1/2, 1/4 or 1/8 inside the IDCT; the largest factor
+    that still covers the preview size is used (TurboJPEG when available).
+    EXIF orientation is applied so portrait shots are not stored sideways.
+    """
+    from PIL import ImageOps
+
+    if _TJ is not None and path.suffix.lower() in {".jpg", ".jpeg"}:
+        buf = path.read_bytes()
+        w, h = _TJ.decode_header(buf)[:2]
+        tw, th = _fit(w, h)
+        n = next((n for n in (8, 4, 2) if w // n >= tw and h // n >= th), 1)
+        img = Image.fromarray(_TJ.decode(buf, pixel_format=TJPF_RGB, scaling_factor=(1, n)))
+        with Image.open(io.BytesIO(buf)) as hdr:  # header only, for the EXIF block
+            if "exif" in hdr.info:
+                img.info["exif"] = hdr.info["exif"]
+        ImageOps.exif_transpose(img, in_place=True)
+        return img
+    with Image.open(path) as img:
+        if img.format == "JPEG":
+            img.draft("RGB", _fit(*img.size))
+        ImageOps.exif_transpose(img, in_place=True)
+        return img.convert("RGB")
+
+
+def _encoder(img):
+    """Return encode(quality, final=False) -> bytes for img in PREVIEW_FORMAT.
+
+    TurboJPEG handles JPEG when available; final=True adds _FINAL_OPTS (Pillow).
+    """
+    if _TJ_ENCODE:
+        arr = np.asarray(img)
+        return lambda q, final=False: _TJ.encode(arr, quality=q, pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420)
+
+    def encode(q: int, final: bool = False) -> bytes:
+        buf = io.BytesIO()
+        img.save(buf, quality=q, **_SAVE_OPTS, **(_FINAL_OPTS if final else {}))
+        return buf.getvalue()
+
+    return encode
+
+
+# candidate qualities, low to high (same grid the old linear 85 -> 25 loop walked)
+_QUALITIES = tuple(range(25, 90, 5))
+
+
+def _encode_to_budget(img, try_top: bool = False) -> bytes:
+    """Highest quality on the grid that fits MAX_BYTES, found by binary search.
+
+    ~4 encodes instead of up to 13; if even the lowest quality is too big, that
+    encode is returned (as before). try_top encodes the top quality first, which
+    usually fits for flat graphics (PNG/GIF) and then ends the search at once.
+
+    Search encodes skip _FINAL_OPTS (JPEG's Huffman optimize pass); only the kept
+    quality is re-encoded with them. Optimizing never grows the file, so it still fits.
+    """
+    encode = _encoder(img)
+    lo, hi = 0, len(_QUALITIES) - 1
+    best = last = None  # (quality, bytes)
+    if try_top:
+        last = (_QUALITIES[hi], encode(_QUALITIES[hi]))
+        if len(last[1]) <= MAX_BYTES:
+            best, lo = last, hi + 1
+        else:
+            hi -= 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        last = (_QUALITIES[mid], encode(_QUALITIES[mid]))
+        if len(last[1]) <= MAX_BYTES:
+            best = last
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    q, data = best or last
+    return encode(q, final=True) if _FINAL_OPTS and not _TJ_ENCODE else data
+
+
+def _small_jpeg_size(src_path: Path, Image) -> list[int] | None:
+    """[w, h] if src is a JPEG that can be served as-is (fits MAX_BYTES and
+    PREVIEW_SIDE, no EXIF rotation), else None. Reads the header only."""
+    if src_path.suffix.lower() not in {".jpg", ".jpeg"} or src_path.stat().st_size > MAX_BYTES:
+        return None
+    with Image.open(src_path) as img:
+        if img.format != "JPEG" or max(img.size) > PREVIEW_SIDE:
+            return None
+        if img.getexif().get(0x0112, 1) != 1:  # Orientation tag
+            return None
+        return list(img.size)
+
+
+def _make_preview(it: dict[str, str]) -> dict[str, str | None]:
+    """Build one preview (runs in a worker process); returns its cache_key, thumb and size."""
+    from PIL import Image
+
+    src_path = Path(it["fs_path"])
+    rel = src_path.relative_to(DOWNLOAD_ROOT)
+    copied = False
+    try:
+        size = _small_jpeg_size(src_path, Image)
+        if size is not None:
+            # already small enough: a file copy instead of decode + encode
+            preview_path = THUMB_DIR / rel
+            preview_path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(preview_path, src_path.read_bytes())
+            copied = True
+        else:
+            preview_path = THUMB_DIR / rel.with_suffix(PREVIEW_SUFFIX)
+            preview_path.parent.mkdir(parents=True, exist_ok=True)
+            img = _decode_rgb(src_path, Image)
+            img.thumbnail((PREVIEW_SIDE, PREVIEW_SIDE), Image.LANCZOS)
+            size = list(img.size)
+            best_bytes = _encode_to_budget(img, try_top=src_path.suffix.lower() not in {".jpg", ".jpeg"})
+            _atomic_write(preview_path, best_bytes)
+        thumb = str(preview_path.relative_to(DOCS_DIR)).replace("\\", "/")
+    except Exception as e:
+        print(f"[gallery] preview failed for {src_path}: {e}")
+        thumb = size = None
+    return {"cache_key": it["cache_key"], "thumb": thumb, "size": size, "copied": copied}
+
+
+def build_previews(items: list[dict[str, str]]) -> bool:
+    """Fill each item's thumb/size; False if previews were skipped entirely."""
+    try:
+        import PIL  # availability check only; workers import PIL.Image themselves
     except Exception as e:
         print(f"[gallery] Pillow not available, skipping previews: {e}")
-        return
+        return False
 
     THUMB_DIR.mkdir(parents=True, exist_ok=True)
+    todo = []
+    dupes: dict[str, list[dict]] = {}  # identical sources share one preview
     for it in items:
         # reuse cached thumbnail if unchanged
         if it.get("cached_thumb"):
             it["thumb"] = it["cached_thumb"]
-            continue
-
-        src_path = Path(it["fs_path"])
-        rel = src_path.relative_to(DOWNLOAD_ROOT)
-        preview_path = THUMB_DIR / rel.with_suffix(".jpg")
-        preview_path.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            with Image.open(src_path) as img:
-                img = img.convert("RGB")
-                best_bytes = None
-                for q in range(85, 24, -5):
-                    buf = io.BytesIO()
-                    img.save(buf, format="JPEG", quality=q, optimize=True)
-                    best_bytes = buf.getvalue()
-                    if buf.tell() <= MAX_BYTES:
-                        break
-                if best_bytes is None:
-                    it["thumb"] = None
-                    continue
-                preview_path.write_bytes(best_bytes)
-                it["thumb"] = str(preview_path.relative_to(DOCS_DIR)).replace("\\", "/")
-        except Exception as e:
-            print(f"[gallery] preview failed for {src_path}: {e}")
-            it["thumb"] = None
-
-
-def write_meta(items: list[dict[str, str]]) -> None:
-    payload = []
+            it["size"] = it.get("cached_size")
+        elif it["hash"] in dupes:
+            dupes[it["hash"]].append(it)
+        else:
+            dupes[it["hash"]] = [it]
+            todo.append({"fs_path": it["fs_path"], "cache_key": it["cache_key"]})
+    if not todo:
+        return True
+
+    # decode/encode is CPU-bound and independent per image: one process per core
+    by_key = {it["cache_key"]: it for it in items}
+    workers = min(WORKERS, len(todo))
+    if workers <= 1:
+        results = list(map(_make_preview, todo))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(_make_preview, todo, chunksize=8))
+    for res in results:
+        for it in dupes[by_key[res["cache_key"]]["hash"]]:
+            it["thumb"] = res["thumb"]
+            it["size"] = res["size"]
+            it["copied"] = res["copied"]
+    return True
+
+
+def prune_previews(items: list[dict[str, str]]) -> None:
+    """Delete preview files no item points at any more (e.g. .jpg left behind after a format switch)."""
+    keep = {DOCS_DIR / it["thumb"] for it in items if it.get("thumb")}
+    for it in items:
+        if not it.get("thumb") and it.get("cached_thumb"):
+            keep.add(DOCS_DIR / it["cached_thumb"])  # failed rebuild: keep the old preview
+    removed = 0
+    for root, dirs, files in os.walk(THUMB_DIR, topdown=False):
+        for f in files:
+            path = Path(root) / f
+            if path not in keep:
+                path.unlink(missing_ok=True)
+                removed += 1
+        if root != str(THUMB_DIR) and not os.listdir(root):
+            os.rmdir(root)
+    if removed:
+        print(f"[gallery] Pruned {removed} stale previews from {THUMB_DIR}")
+
+
+def load_meta() -> tuple[list[str], dict]:
+    """Previous (order, entries) from META_FILE; the old {"items": [...]} form counts as empty."""
+    try:
+        data = _json_loads(META_FILE.read_bytes())
+        return data["order"], data["entries"]
+    except Exception:
+        return [], {}
+
+
+def write_meta(items: list[dict[str, str]]) -> list[dict]:
+    """Write META_FILE (unless unchanged) and return its entries in display order."""
+    prior_order, prior = load_meta()
+    order: list[str] = []
+    entries: dict[str, dict] = {}
+    changed = 0
     for it in items:
         thumb = it.get("thumb") or it["src"]  # fall back to original if no preview
-        payload.append(
-            {
-                "thumb": thumb,
-                "full": thumb,  # originals often 404 on Pages; serve preview
-                "name": it["name"],
-                "folder": it["folder"],
-                "mtime": it["mtime"],
-            }
-        )
-    META_FILE.write_text(json.dumps({"items": payload}, ensure_ascii=False), encoding="utf-8")
-    print(f"[gallery] Wrote {META_FILE} with {len(payload)} entries")
+        entry = {
+            "thumb": thumb,
+            "full": thumb,  # originals often 404 on Pages; serve preview
+            "name": it["name"],
+            "folder": it["folder"],
+        }
+        # no mtime here: a fresh CI checkout resets it and would mark every entry changed
+        if it.get("thumb") and it.get("size"):
+            # preview dimensions let the page size cards before the image loads
+            entry["w"], entry["h"] = it["size"]
+        key = it["cache_key"]
+        old = prior.get(key)
+        if old == entry:
+            entry = old
+        else:
+            changed += 1
+        order.append(key)
+        entries[key] = entry
+    # unchanged gallery: leave the file (and the Pages deploy) alone
+    if not changed and order == prior_order:
+        print(f"[gallery] {META_FILE} unchanged ({len(order)} entries)")
+        return list(entries.values())
+    _atomic_write(META_FILE, _json_dumps({"order": order, "entries": entries}))
+    print(f"[gallery] Wrote {META_FILE} with {len(order)} entries ({changed} changed)")
+    return list(entries.values())
 
 
 def load_cache() -> dict:
     if not CACHE_FILE.exists():
         return {}
     try:
-        return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+        return _json_loads(CACHE_FILE.read_bytes())
     except Exception:
         return {}
 
 
+def _without_mtime(cache: dict) -> dict:
+    return {k: {f: v for f, v in e.items() if f != "mtime"} for k, e in cache.items()}
+
+
 def save_cache(items: list[dict[str, str]]) -> None:
     data = {}
     for it in items:
         if it.get("thumb"):
             data[it["cache_key"]] = {"thumb": it["thumb"], "mtime": it["mtime"]}
-    CACHE_FILE.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            if it.get("size"):
+                data[it["cache_key"]]["size"] = it["size"]
+            if it.get("hash"):
+                data[it["cache_key"]]["hash"] = it["hash"]
+            if it.get("copied"):
+                data[it["cache_key"]]["copied"] = True
+    # mtimes alone change on every checkout; don't rewrite (and re-commit) for that
+    if _without_mtime(data) == _without_mtime(load_cache()):
+        print(f"[gallery] {CACHE_FILE} unchanged ({len(data)} items)")
+        return
+    _atomic_write(CACHE_FILE, _json_dumps(data))
     print(f"[gallery] Wrote cache for {len(data)} items -> {CACHE_FILE}")
 
 
-def render_base(count: int) -> str:
-    # minimal shell; cards are injected via meta.json
-    return f"""<!doctype html>
-<html lang="zh-CN">
-<head>
-  <meta charset="utf-8" />
-  <meta name="viewport" content="width=device-width, initial-scale=1" />
-  <title>{html.escape(TITLE)}</title>
-  <style>
-    :root {{
+# static parts of the page shell, built once at import
+_TITLE_HTML = html.escape(TITLE)
+_BASE_CSS = """    :root {
       --bg: #0a0d12;
       --card: #111826;
       --border: #1c2737;
       --text: #e7ecf4;
       --muted: #9fb4ce;
-    }}
-    * {{ box-sizing: border-box; }}
-    body {{
+    }
+    * { box-sizing: border-box; }
+    body {
       margin: 0;
       background: var(--bg);
       color: var(--text);
       font-family: "Segoe UI", "Noto Sans SC", system-ui, -apple-system, sans-serif;
-    }}
-    header {{
+    }
+    header {
       padding: 16px 20px;
       font-weight: 600;
       font-size: 18px;
-    }}
-    header .count {{ color: var(--muted); font-weight: 400; margin-left: 8px; }}
-    .grid {{
+    }
+    header .count { color: var(--muted); font-weight: 400; margin-left: 8px; }
+    .grid {
       display: grid;
       grid-template-columns: repeat(auto-fill, minmax(260px, 1fr));
       grid-auto-rows: 10px;
       grid-auto-flow: dense;
       gap: 12px;
       padding: 0 16px 32px;
-    }}
-    @media (max-width: 900px) {{
-      .grid {{ grid-template-columns: repeat(auto-fill, minmax(200px, 1fr)); }}
-    }}
-    @media (max-width: 640px) {{
-      .grid {{ grid-template-columns: repeat(auto-fill, minmax(160px, 1fr)); }}
-    }}
-    .card {{
+    }
+    @media (max-width: 900px) {
+      .grid { grid-template-columns: repeat(auto-fill, minmax(200px, 1fr)); }
+    }
+    @media (max-width: 640px) {
+      .grid { grid-template-columns: repeat(auto-fill, minmax(160px, 1fr)); }
+    }
+    .card {
       background: var(--card);
       border: 1px solid var(--border);
       border-radius: 10px;
       overflow: hidden;
       box-shadow: 0 10px 30px rgba(0,0,0,.28);
-    }}
-    .card img {{
+    }
+    .card img {
       display: block;
       width: 100%;
       height: auto;
-    }}
-    .empty {{ padding: 18px; color: var(--muted); }}
-    .pager {{
+    }
+    .empty { padding: 18px; color: var(--muted); }
+    .pager {
       text-align: center;
       padding: 12px 0 20px;
-    }}
-    .load-more {{
+    }
+    .load-more {
       background: var(--card);
       color: var(--text);
       border: 1px solid var(--border);
@@ -221,44 +549,47 @@ def render_base(count: int) -> str:
       padding: 10px 16px;
       cursor: pointer;
       font-weight: 600;
-    }}
-    .load-more:disabled {{
+    }
+    .load-more:disabled {
       opacity: 0.4;
       cursor: default;
-    }}
-  </style>
-</head>
-<body>
-  <header>{html.escape(TITLE)}<span class="count">{count} images</span></header>
-  <section class="grid" id="grid">
-    <p class="empty" id="loading">Loading…</p>
-  </section>
-  <div class="pager">
-    <button class="load-more" id="loadMore" disabled>Load more</button>
-  </div>
-  <script>
-    const PAGE_SIZE = 60;
+    }
+"""
+_BASE_JS = """    const PAGE_SIZE = 60;
     let items = [];
-    let cursor = 0;
+    // cards already rendered into the page at build time
+    let cursor = parseInt(document.querySelector('meta[name="gallery-cursor"]').content, 10) || 0;
     const gridEl = document.getElementById('grid');
+    const btn = document.getElementById('loadMore');
+    const total = parseInt(document.querySelector('.count').textContent, 10) || 0;
 
-    function setSpan(card, img) {{
+    function setSpan(card, w, h) {
       const styles = window.getComputedStyle(gridEl);
       const rowHeight = parseFloat(styles.gridAutoRows) || 10;
       const rowGap = parseFloat(styles.rowGap || styles.gap) || 0;
       const cardWidth = card.getBoundingClientRect().width || 260;
-      const ratio = img.naturalHeight && img.naturalWidth ? (img.naturalHeight / img.naturalWidth) : 1;
+      const ratio = h && w ? (h / w) : 1;
       const height = cardWidth * ratio;
       const span = Math.max(1, Math.ceil((height + rowGap) / (rowHeight + rowGap)));
       card.style.gridRowEnd = `span ${span}`;
-    }}
+    }
 
-    function renderMore() {{
+    function updateButton(count) {
+      if (cursor >= count) {
+        btn.disabled = true;
+        btn.textContent = 'All loaded';
+      } else {
+        btn.disabled = false;
+        btn.textContent = 'Load more (' + cursor + '/' + count + ')';
+      }
+    }
+
+    function renderMore() {
       const grid = gridEl;
       if (!items.length) return;
       const end = Math.min(cursor + PAGE_SIZE, items.length);
       const frag = document.createDocumentFragment();
-      for (let i = cursor; i < end; i++) {{
+      for (let i = cursor; i < end; i++) {
         const it = items[i];
         const art = document.createElement('article');
         art.className = 'card';
@@ -270,58 +601,115 @@ def render_base(count: int) -> str:
         img.loading = 'lazy';
         img.src = it.thumb;
         img.alt = '';
-        img.addEventListener('load', () => setSpan(art, img));
+        // meta.json carries preview dimensions; older entries wait for the image
+        if (!(it.w && it.h)) img.addEventListener('load', () => setSpan(art, img.naturalWidth, img.naturalHeight));
         a.appendChild(img);
         art.appendChild(a);
         frag.appendChild(art);
-      }}
+      }
       if (cursor === 0) grid.innerHTML = '';
       grid.appendChild(frag);
+      for (let i = cursor; i < end; i++) {
+        const it = items[i];
+        if (it.w && it.h) setSpan(grid.children[i], it.w, it.h);
+      }
       cursor = end;
-      const btn = document.getElementById('loadMore');
-      if (cursor >= items.length) {{
-        btn.disabled = true;
-        btn.textContent = 'All loaded';
-      }} else {{
-        btn.disabled = false;
-        btn.textContent = 'Load more (' + cursor + '/' + items.length + ')';
-      }}
-    }}
+      updateButton(items.length);
+    }
 
-    async function load() {{
-      const grid = document.getElementById('grid');
+    async function load() {
       const loading = document.getElementById('loading');
-      const btn = document.getElementById('loadMore');
-      try {{
+      try {
         const res = await fetch('meta.json?_=' + Date.now());
         const data = await res.json();
-        items = data.items || [];
+        items = data.order ? data.order.map(k => data.entries[k]) : (data.items || []);
         const countEl = document.querySelector('.count');
         countEl.textContent = items.length + ' images';
         if (loading) loading.remove();
-        btn.disabled = false;
         renderMore();
-      }} catch (e) {{
+      } catch (e) {
         if (loading) loading.textContent = 'Failed to load gallery.';
+        else btn.disabled = false;  // build-time cards shown; let the click retry
         console.error(e);
-      }}
-    }}
-    load();
-
-    document.getElementById('loadMore').addEventListener('click', () => {{
-      renderMore();
-    }});
-  </script>
+      }
+    }
+
+    // size the build-time cards; meta.json is only fetched for the rest
+    for (const card of gridEl.querySelectorAll('.card')) {
+      const w = +card.dataset.w, h = +card.dataset.h;
+      const img = card.querySelector('img');
+      if (w && h) setSpan(card, w, h);
+      else if (img.complete) setSpan(card, img.naturalWidth, img.naturalHeight);
+      else img.addEventListener('load', () => setSpan(card, img.naturalWidth, img.naturalHeight));
+    }
+    if (cursor === 0) load();
+    else updateButton(total);
+
+    btn.addEventListener('click', async () => {
+      if (!items.length) {
+        btn.disabled = true;
+        await load();
+      } else {
+        renderMore();
+      }
+    });
+"""
+
+
+def _card_html(entry: dict) -> str:
+    """One build-time card; same markup renderMore() creates client-side."""
+    dims = f' data-w="{entry["w"]}" data-h="{entry["h"]}"' if entry.get("w") and entry.get("h") else ""
+    return (
+        f'    <article class="card"{dims}><a href="{html.escape(entry["full"])}" target="_blank" rel="noopener">'
+        f'<img loading="lazy" src="{html.escape(entry["thumb"])}" alt="" /></a></article>\n'
+    )
+
+
+@lru_cache(maxsize=4)
+def render_base(count: int, first: tuple = ()) -> str:
+    """Page shell with the first page of cards rendered in; the rest come from meta.json.
+
+    first holds up to PAGE_SIZE meta.json entries as (key, value) tuples (hashable for the cache).
+    """
+    cards = "".join(_card_html(dict(e)) for e in first)
+    body = cards or '    <p class="empty" id="loading">Loading…</p>\n'
+    return f"""<!doctype html>
+<html lang="zh-CN">
+<head>
+  <meta charset="utf-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1" />
+  <meta name="gallery-cursor" content="{len(first)}" />
+  <title>{_TITLE_HTML}</title>
+  <style>
+{_BASE_CSS}  </style>
+</head>
+<body>
+  <header>{_TITLE_HTML}<span class="count">{count} images</span></header>
+  <section class="grid" id="grid">
+{body}  </section>
+  <div class="pager">
+    <button class="load-more" id="loadMore" disabled>Load more</button>
+  </div>
+  <script>
+{_BASE_JS}  </script>
 </body>
 </html>"""
 
 
 def main() -> None:
     items = find_images()
-    build_previews(items)
+    previews = build_previews(items)
     DOCS_DIR.mkdir(parents=True, exist_ok=True)
-    write_meta(items)
+    entries = write_meta(items)
     save_cache(items)
+    if previews:
+        prune_previews(items)
+    if RENDER_INDEX:
+        first = tuple(tuple(e.items()) for e in entries[:PAGE_SIZE])
+        index = DOCS_DIR / "index.html"
+        _atomic_write(index, render_base(len(entries), first).encode("utf-8"))
+        print(f"[gallery] Wrote {index} with {len(first)} pre-rendered cards")
+        return
     print(f"[gallery] Previews + meta ready for manual index (items: {len(items)})")
 
 